@@ -7,7 +7,10 @@ Refactored into modular components for better maintainability.
 """
 
 import asyncio
+import logging
 import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.live import Live
 
@@ -21,7 +24,7 @@ from panels.hive_stats_panel import create_hive_stats_panel
 from panels.logs_panel import create_logs_panel
 from panels.video_transcoder_panel import create_video_transcoder_panel
 from panels.unified_video_activity_panel import create_unified_video_activity_panel
-from panels.instagram_panel import create_instagram_panel, create_instagram_logs_panel
+from panels.instagram_panel import create_instagram_panel, create_instagram_logs_panel, refresh_probes
 from panels.webapp_logs_panel import create_webapp_logs_panel, create_webapp_error_summary_panel
 # Utils
 from utils.layout import (
@@ -37,6 +40,11 @@ from utils.layout import (
 console = Console()
 
 
+async def build_panel(factory, *args):
+    """Build a panel in the default executor so its blocking I/O never stalls the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, factory, *args)
+
+
 async def run_periodic_speed_test(monitor: ServiceMonitor):
     """Run speed test every 15 minutes asynchronously"""
     while True:
@@ -44,6 +52,30 @@ async def run_periodic_speed_test(monitor: ServiceMonitor):
         await asyncio.sleep(900)  # 15 minutes
 
 
+async def refresh_internet_connection(monitor: ServiceMonitor):
+    """Probe internet connectivity every 5 seconds"""
+    while True:
+        await monitor.check_internet_connection_async()
+        await asyncio.sleep(5)
+
+
+async def refresh_hive_stats(monitor: ServiceMonitor):
+    """Refresh Hive stats every 5 minutes (every 30s until a fetch succeeds)"""
+    while True:
+        await monitor.fetch_hive_stats_async()
+        await asyncio.sleep(300 if monitor.hive_stats_error is None else 30)
+
+
+async def refresh_instagram_probes():
+    """Refresh Instagram health, cookie and log probes every 10 seconds"""
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, refresh_probes)
+        except Exception as e:
+            console.print(f"[red]Error refreshing Instagram probes: {e}[/red]")
+        await asyncio.sleep(10)
+
+
 async def update_unified_video_activity():
     """Update unified video activity every 30 seconds"""
     while True:
@@ -56,6 +88,10 @@ async def update_unified_video_activity():
 
 async def main():
     """Main dashboard loop with responsive design"""
+    # Bounded pool for blocking panel/monitor work run off the event loop
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=16, thread_name_prefix="dashboard")
+    )
     monitor = ServiceMonitor()
     
     # Print initial terminal size info
@@ -76,6 +112,10 @@ async def main():
     speed_test_task = asyncio.create_task(run_periodic_speed_test(monitor))
     # Start unified video activity monitoring
     video_activity_task = asyncio.create_task(update_unified_video_activity())
+    # Keep network fetches for the internet, Hive and Instagram panels off the render path
+    internet_task = asyncio.create_task(refresh_internet_connection(monitor))
+    hive_stats_task = asyncio.create_task(refresh_hive_stats(monitor))
+    instagram_probes_task = asyncio.create_task(refresh_instagram_probes())
     
     try:
         with Live(layout, refresh_per_second=1, screen=True, auto_refresh=True):
@@ -95,27 +135,27 @@ async def main():
                         pass
                     
                     try:
-                        layout["internet"].update(create_internet_panel(monitor))
+                        layout["internet"].update(await build_panel(create_internet_panel, monitor))
                     except KeyError:
                         pass
                     
                     try:
-                        layout["services"].update(create_services_panel(monitor))
+                        layout["services"].update(await build_panel(create_services_panel, monitor))
                     except KeyError:
                         pass
                     
                     try:
-                        layout["error_monitor"].update(create_error_monitor_panel(monitor))
+                        layout["error_monitor"].update(await build_panel(create_error_monitor_panel, monitor))
                     except KeyError:
                         pass
                     
                     try:
-                        layout["instagram"].update(create_instagram_panel(monitor))
+                        layout["instagram"].update(await build_panel(create_instagram_panel, monitor))
                     except KeyError:
                         pass
                     
                     try:
-                        layout["hive_stats"].update(create_hive_stats_panel(monitor))
+                        layout["hive_stats"].update(await build_panel(create_hive_stats_panel, monitor))
                     except KeyError:
                         pass
                     
@@ -126,22 +166,22 @@ async def main():
                     
                     try:
                         layout["video_logs"].update(
-                            create_logs_panel(monitor, "video-worker", "📹 Video Worker Container Logs")
+                            await build_panel(create_logs_panel, monitor, "video-worker", "📹 Video Worker Container Logs")
                         )
                     except KeyError:
                         try:
                             # For compact layout, combine both logs
-                            layout["logs"].update(create_instagram_logs_panel(monitor))
+                            layout["logs"].update(await build_panel(create_instagram_logs_panel, monitor))
                         except KeyError:
                             pass
                     
                     try:
-                        layout["webapp_logs"].update(create_webapp_logs_panel())
+                        layout["webapp_logs"].update(await build_panel(create_webapp_logs_panel))
                     except KeyError:
                         pass
                     
                     try:
-                        layout["instagram_logs"].update(create_instagram_logs_panel(monitor))
+                        layout["instagram_logs"].update(await build_panel(create_instagram_logs_panel, monitor))
                     except KeyError:
                         pass
                     
@@ -159,10 +199,20 @@ async def main():
         speed_test_task.cancel()
         initial_speedtest_task.cancel()
         video_activity_task.cancel()
+        internet_task.cancel()
+        hive_stats_task.cancel()
+        instagram_probes_task.cancel()
         console.print("\n[yellow]Dashboard stopped.[/yellow]")
 
 
 if __name__ == "__main__":
+    # Module warnings go to a file so they never draw over the Live display
+    logging.basicConfig(
+        filename=Path(__file__).with_name("dashboard.log"),
+        level=logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    
     # Check for dependencies
     speedtest_available = False
     for cmd in ["speedtest", "speedtest-cli"]:
@@ -20,11 +20,11 @@ def main():
     for service_name in monitor.services:
         health = monitor.check_service_health(service_name)
         
-        if "🔴" in health['status']:
+        if "🔴" in health.status:
             failed_services.append({
                 'name': service_name,
-                'status': health['status'],
-                'details': health.get('details', 'N/A')
+                'status': health.status,
+                'details': health.details or 'N/A'
             })
     
     if failed_services:
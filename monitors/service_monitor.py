@@ -5,11 +5,20 @@ Handles monitoring of services, internet connectivity, and Hive community stats
 """
 
 import asyncio
+import functools
 import json
+import os
+import shutil
 import subprocess
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional
 
 import requests
 
@@ -26,28 +35,93 @@ from config import (
     SKATEHIVE_NODES,
     get_external_url,
 )
+from utils.http import json_loads, session
+from utils.timestamps import log_time_key
+
+
+class HealthResult(NamedTuple):
+    """Outcome of one service health check"""
+    status: str
+    response_time: str
+    uptime: str
+    details: str
+
+
+def _format_response_time(response) -> str:
+    """Round-trip time of a requests response, formatted like 42ms"""
+    return f"{response.elapsed.total_seconds() * 1000.0:.0f}ms"
+
+
+def _parse_ookla_speedtest(data: Dict) -> tuple:
+    """Ookla speedtest: bandwidth in bytes/s, latency in ms"""
+    return (
+        data["download"]["bandwidth"] * 8 / 1_000_000,  # Convert bytes to Mbps
+        data["upload"]["bandwidth"] * 8 / 1_000_000,
+        data["ping"]["latency"],
+    )
+
+
+def _parse_speedtest_cli(data: Dict) -> tuple:
+    """speedtest-cli: speeds in bits/s, ping in ms"""
+    return data["download"] / 1_000_000, data["upload"] / 1_000_000, data["ping"]
+
+
+def _parse_alt_speedtest(data: Dict) -> tuple:
+    """Alternative format: human-readable strings such as 93.4 Mbit/s"""
+    return (
+        float(str(data["Download"]).split()[0]),
+        float(str(data["Upload"]).split()[0]),
+        float(str(data.get("Ping", "0")).split()[0]),
+    )
 
 
 class ServiceMonitor:
-    def __init__(self):
-        # Build URLs from configuration
-        self.base_url = f"https://{TAILSCALE_HOSTNAME}" if TAILSCALE_HOSTNAME else ""
-        
-        # Build services dict dynamically from config
-        self.services = {}
+    # Local containers whose resource usage is shown in the services panel
+    WATCHED_CONTAINERS = ("video-worker", "ytipfs-worker")
+    # (connect, read) timeouts for every HTTP probe, so a slow handshake
+    # fails fast instead of eating the whole budget (seconds)
+    HTTP_TIMEOUT = (2.0, 5.0)
+    # Timeout for the batched `docker inspect` behind container uptimes (seconds)
+    DOCKER_INSPECT_TIMEOUT = 10.0
+    # Wall-clock budget for one round of parallel health checks: one probe's worst
+    # case (HTTP connect + read, then the uptime lookup's docker inspect) plus a
+    # margin, so only a stuck check is cut off (seconds)
+    HEALTH_CHECK_BUDGET = sum(HTTP_TIMEOUT) + DOCKER_INSPECT_TIMEOUT + 1.0
+    # How long one `tailscale status --json` snapshot is reused (seconds)
+    TAILSCALE_CACHE_TTL = 5.0
+    # How long one batched `docker inspect` of all containers is reused (seconds)
+    DOCKER_STATE_TTL = 15.0
+    # How long fetched Hive community stats are served without refetching (seconds)
+    HIVE_STATS_TTL = 60.0
+    # (power-of-two shift, suffix) for _format_bytes, largest first
+    _BYTE_UNITS = ((30, "GB"), (20, "MB"), (10, "KB"))
+    # (shape test, parser) per speedtest JSON format, checked in order
+    _SPEEDTEST_PARSERS = (
+        (lambda d: isinstance(d.get("download"), dict) and "bandwidth" in d["download"],
+         _parse_ookla_speedtest),
+        (lambda d: isinstance(d.get("download"), (int, float)), _parse_speedtest_cli),
+        (lambda d: "Download" in d and "Upload" in d, _parse_alt_speedtest),
+    )
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_services(cls) -> MappingProxyType:
+        """Build the read-only services table from configuration, once per process"""
+        base_url = f"https://{TAILSCALE_HOSTNAME}" if TAILSCALE_HOSTNAME else ""
+        services = {}
         
         # Local services
         if TAILSCALE_HOSTNAME:
-            self.services["ytipfs-worker"] = {
-                "url": f"{self.base_url}{INSTAGRAM_FUNNEL_PATH}/health",
+            services["ytipfs-worker"] = {
+                "url": f"{base_url}{INSTAGRAM_FUNNEL_PATH}/health",
                 "port": INSTAGRAM_DOWNLOADER_PORT,
                 "container": "ytipfs-worker",
                 "check_type": "json_key",
                 "expected_key": "status",
                 "expected_value": "ok"
             }
-            self.services["video-worker"] = {
-                "url": f"{self.base_url}{VIDEO_FUNNEL_PATH}/healthz",
+            services["video-worker"] = {
+                "url": f"{base_url}{VIDEO_FUNNEL_PATH}/healthz",
                 "port": VIDEO_TRANSCODER_PORT,
                 "container": "video-worker",
                 "check_type": "json_key",
@@ -73,7 +147,7 @@ class ServiceMonitor:
                     video_url = f"https://{hostname}{VIDEO_FUNNEL_PATH}/healthz"
                     instagram_url = f"https://{hostname}{INSTAGRAM_FUNNEL_PATH}/health"
                 
-                self.services[f"{node_id}-video"] = {
+                services[f"{node_id}-video"] = {
                     "url": video_url,
                     "port": video_port if lan_ip else 443,
                     "container": f"{node_id}-video-worker",
@@ -84,7 +158,7 @@ class ServiceMonitor:
                     "node_name": node_info.get('name', node_id),
                     "lan_ip": lan_ip,
                 }
-                self.services[f"{node_id}-instagram"] = {
+                services[f"{node_id}-instagram"] = {
                     "url": instagram_url,
                     "port": instagram_port if lan_ip else 443,
                     "container": f"{node_id}-ytipfs-worker",
@@ -95,88 +169,188 @@ class ServiceMonitor:
                     "node_name": node_info.get('name', node_id),
                     "lan_ip": lan_ip,
                 }
+        
+        return MappingProxyType({
+            name: MappingProxyType(service) for name, service in services.items()
+        })
+    
+    def __init__(self):
+        # Build URLs from configuration
+        self.base_url = f"https://{TAILSCALE_HOSTNAME}" if TAILSCALE_HOSTNAME else ""
+        
+        # Services come from configuration, which is fixed at import time
+        self.services = self._build_services()
 
+        # Latest connectivity probe; refreshed in the background, read by the internet panel
+        self.internet_status = {"status": "⏳ Checking...", "latency": "N/A"}
         self.internet_speed = {"download": 0, "upload": 0, "ping": 0}
+        # Wall-clock time of the last completed speed test, for display
         self.last_speed_test = None
+        # time.monotonic() of the last completed speed test (0.0 = never), for age checks
+        self.speed_test_finished_at = 0.0
         self.speedtest_status = "Initializing..."  # Initial status
         self.speedtest_error = None
+        # Resolved speedtest candidates, and the one that last worked
+        self._speedtest_candidates: Optional[List[List[str]]] = None
+        self._speedtest_cmd: Optional[List[str]] = None
         self.hive_stats = {}
+        # Wall-clock time of the last successful fetch, for display
         self.last_hive_stats_fetch = None
+        # time.monotonic() of the last successful fetch (0.0 = never), for age checks
+        self.hive_stats_fetched_at = 0.0
+        # Where the stats object sits in the response (None = top level)
+        self._hive_stats_key = None
         self.hive_stats_error = None
+        # Bumped on every successful fetch so panels can skip rebuilding unchanged stats
+        self.hive_stats_version = 0
+        # Serializes fetch_hive_stats; the attempt time lets waiters reuse its outcome
+        self._hive_stats_lock = threading.Lock()
+        self._hive_attempted_at = 0.0
+        # Per-container log tail and the docker timestamp of the newest line read,
+        # so subsequent polls only pull new lines with --since
+        self._log_buffers: Dict[str, deque] = {}
+        self._last_log_time: Dict[str, str] = {}
+        # Probe once whether docker needs sudo instead of retrying every call
+        self._docker_prefix = self._detect_docker_prefix()
+        # Keep-alive connection pool shared by every HTTP probe
+        self.http = session
+        # container name -> .State from one batched `docker inspect`
+        self._docker_state: Dict[str, Dict] = {}
+        self._docker_state_at = 0.0
+        self._docker_state_lock = threading.Lock()
+        # (fetched_at, peers by hostname, error status) from `tailscale status`
+        self._tailscale_cache = (0.0, {}, None)
+        self._tailscale_lock = threading.Lock()
+        # Real page size for /proc statm (16KB on some ARM64 kernels)
+        self._page_size = os.sysconf("SC_PAGESIZE") if hasattr(os, "sysconf") else 4096
+        # Worker threads for running the health checks side by side
+        self._health_executor = ThreadPoolExecutor(
+            max_workers=max(1, min(len(self.services), 16)),
+            thread_name_prefix="health-check"
+        )
         
+    @staticmethod
+    def _detect_docker_prefix() -> List[str]:
+        """Return the command prefix that can reach the Docker daemon"""
+        try:
+            result = subprocess.run(
+                ["docker", "info"],
+                capture_output=True,
+                text=True,
+                timeout=3
+            )
+            if result.returncode != 0 and "permission denied" in result.stderr.lower():
+                return ["sudo", "docker"]
+        except PermissionError:
+            return ["sudo", "docker"]
+        except Exception:
+            pass
+        return ["docker"]
+    
     def check_internet_connection(self) -> Dict:
-        """Check basic internet connectivity"""
+        """Check basic internet connectivity and store it as internet_status"""
         try:
-            response = requests.get("https://8.8.8.8", timeout=5)
-            return {"status": "🟢 Online", "latency": f"{response.elapsed.total_seconds()*1000:.0f}ms"}
+            # HEAD: only the round trip matters, not the body
+            response = self.http.head("https://1.1.1.1", timeout=self.HTTP_TIMEOUT)
+            status = {"status": "🟢 Online", "latency": _format_response_time(response)}
         except:
-            return {"status": "🔴 Offline", "latency": "N/A"}
+            status = {"status": "🔴 Offline", "latency": "N/A"}
+        self.internet_status = status
+        return status
+    
+    def _store_hive_stats(self, stats: Dict) -> Dict:
+        """Record a successful Hive stats fetch"""
+        self.hive_stats = stats
+        self.last_hive_stats_fetch = datetime.now()
+        self.hive_stats_fetched_at = time.monotonic()
+        self.hive_stats_error = None
+        self.hive_stats_version += 1
+        return stats
     
     def fetch_hive_stats(self) -> Dict:
-        """Fetch Hive community stats from API"""
-        # Use urllib (built into Python) instead of requests
+        """Fetch Hive community stats from API, reusing a result younger than HIVE_STATS_TTL
+
+        Concurrent callers share one request: whoever arrives while a fetch is
+        running waits for it and returns its outcome instead of fetching again.
+        """
+        if self.hive_stats and time.monotonic() - self.hive_stats_fetched_at < self.HIVE_STATS_TTL:
+            return self.hive_stats
+        
+        waited_from = time.monotonic()
+        with self._hive_stats_lock:
+            if self._hive_attempted_at > waited_from:
+                return self.hive_stats if self.hive_stats_error is None else {}
+            try:
+                return self._request_hive_stats()
+            finally:
+                self._hive_attempted_at = time.monotonic()
+    
+    def _request_hive_stats(self) -> Dict:
+        """One Hive stats API request; records the stats or hive_stats_error"""
         try:
-            import urllib.request
-            import json
+            response = self.http.get("https://stats.hivehub.dev/communities?c=hive-173115", timeout=self.HTTP_TIMEOUT)
+            response.raise_for_status()
+            data = json_loads(response.content)
             
-            with urllib.request.urlopen("https://stats.hivehub.dev/communities?c=hive-173115", timeout=10) as response:
-                raw_data = response.read().decode()
-                data = json.loads(raw_data)
-                
-                # Debug: Let's see what we actually get
-                if isinstance(data, dict):
-                    # Check if it's the expected format or if it's nested
-                    if 'total_subscribers' in data:
-                        self.hive_stats = data
-                        self.last_hive_stats_fetch = datetime.now()
-                        self.hive_stats_error = None
-                        return data
-                    elif isinstance(data, dict) and len(data) > 0:
-                        # Maybe the data is nested? Let's try to find the actual stats
-                        for key, value in data.items():
-                            if isinstance(value, dict) and 'total_subscribers' in value:
-                                self.hive_stats = value
-                                self.last_hive_stats_fetch = datetime.now()
-                                self.hive_stats_error = None
-                                return value
-                        # If we get here, log what keys we found
-                        keys = list(data.keys())[:3]  # First 3 keys
-                        self.hive_stats_error = f"No total_subscribers. Keys: {keys}"
-                    else:
-                        self.hive_stats_error = f"Empty dict response"
-                elif isinstance(data, list) and len(data) > 0:
-                    # Maybe it's a list with the stats inside?
-                    first_item = data[0]
-                    if isinstance(first_item, dict) and 'total_subscribers' in first_item:
-                        self.hive_stats = first_item
-                        self.last_hive_stats_fetch = datetime.now()
-                        self.hive_stats_error = None
-                        return first_item
-                    else:
-                        self.hive_stats_error = f"List but no stats in first item"
+            # Fast path: the stats object itself, or wherever it was found last time
+            try:
+                stats = data if self._hive_stats_key is None else data[self._hive_stats_key]
+                stats["total_subscribers"]
+                return self._store_hive_stats(stats)
+            except (KeyError, IndexError, TypeError):
+                pass
+            
+            # Slow path: discover where the stats live and remember it
+            if isinstance(data, dict):
+                if 'total_subscribers' in data:
+                    self._hive_stats_key = None
+                    return self._store_hive_stats(data)
+                elif len(data) > 0:
+                    # Maybe the data is nested? Let's try to find the actual stats
+                    for key, value in data.items():
+                        if isinstance(value, dict) and 'total_subscribers' in value:
+                            self._hive_stats_key = key
+                            return self._store_hive_stats(value)
+                    # If we get here, log what keys we found
+                    keys = list(data.keys())[:3]  # First 3 keys
+                    self.hive_stats_error = f"No total_subscribers. Keys: {keys}"
                 else:
-                    self.hive_stats_error = f"Response type: {type(data)}"
-                    
+                    self.hive_stats_error = f"Empty dict response"
+            elif isinstance(data, list) and len(data) > 0:
+                # Maybe it's a list with the stats inside?
+                first_item = data[0]
+                if isinstance(first_item, dict) and 'total_subscribers' in first_item:
+                    self._hive_stats_key = 0
+                    return self._store_hive_stats(first_item)
+                else:
+                    self.hive_stats_error = f"List but no stats in first item"
+            else:
+                self.hive_stats_error = f"Response type: {type(data)}"
+                
         except json.JSONDecodeError as e:
             self.hive_stats_error = f"JSON error: {str(e)[:20]}"
         except Exception as e:
-            self.hive_stats_error = f"urllib: {str(e)[:25]}"
+            self.hive_stats_error = f"HTTP: {str(e)[:25]}"
         return {}
     
-    async def run_speed_test_async(self):
-        """Run internet speed test asynchronously using speedtest"""
-        self.speedtest_status = "Running test..."
-        self.speedtest_error = None
+    def _speedtest_commands(self) -> List[List[str]]:
+        """Speedtest commands worth spawning, best first
+
+        Binaries are resolved with shutil.which once, so missing candidates
+        never cost a subprocess; after a successful run only that command is
+        tried again.
+        """
+        if self._speedtest_cmd:
+            return [self._speedtest_cmd]
+        if self._speedtest_candidates is not None:
+            return self._speedtest_candidates
         
         # Prefer bundled virtualenv speedtest-cli to avoid Ookla rate limits
         venv_speedtest = Path(__file__).resolve().parent.parent / "venv" / "bin" / "speedtest"
-        if venv_speedtest.exists():
-            preferred_cmd = [str(venv_speedtest), "--json"]
-        else:
-            preferred_cmd = None
         
         # Try different speedtest commands
         commands_to_try = [
+            [str(venv_speedtest), "--json"],
             ["speedtest", "--format=json"],
             ["speedtest", "--json"],  # fallback for older versions
             ["speedtest-cli", "--json"],
@@ -184,8 +358,28 @@ class ServiceMonitor:
             ["/usr/local/bin/speedtest", "--format=json"]
         ]
         
-        if preferred_cmd:
-            commands_to_try.insert(0, preferred_cmd)
+        candidates = []
+        for binary, *args in commands_to_try:
+            path = shutil.which(binary)
+            if path and [path, *args] not in candidates:
+                candidates.append([path, *args])
+        self._speedtest_candidates = candidates
+        return candidates
+    
+    @classmethod
+    def _parse_speedtest_result(cls, data: Dict) -> tuple:
+        """Return (download Mbps, upload Mbps, ping ms) for any known speedtest JSON shape"""
+        for matches, parse in cls._SPEEDTEST_PARSERS:
+            if matches(data):
+                return parse(data)
+        return 0, 0, 0
+    
+    async def run_speed_test_async(self):
+        """Run internet speed test asynchronously using speedtest"""
+        self.speedtest_status = "Running test..."
+        self.speedtest_error = None
+        
+        commands_to_try = self._speedtest_commands()
         
         for cmd in commands_to_try:
             try:
@@ -204,27 +398,9 @@ class ServiceMonitor:
                     
                 if proc.returncode == 0:
                     try:
-                        data = json.loads(stdout.decode())
+                        data = json_loads(stdout)
                         # Handle different JSON formats from different speedtest tools
-                        download_speed = 0
-                        upload_speed = 0
-                        ping_time = 0
-                        
-                        # Ookla speedtest format
-                        if "download" in data and "bandwidth" in data["download"]:
-                            download_speed = data["download"]["bandwidth"] * 8 / 1_000_000  # Convert bytes to Mbps
-                            upload_speed = data["upload"]["bandwidth"] * 8 / 1_000_000
-                            ping_time = data["ping"]["latency"]
-                        # speedtest-cli format
-                        elif "download" in data and isinstance(data["download"], (int, float)):
-                            download_speed = data["download"] / 1_000_000
-                            upload_speed = data["upload"] / 1_000_000
-                            ping_time = data["ping"]
-                        # Alternative format
-                        elif "Download" in data and "Upload" in data:
-                            download_speed = float(str(data["Download"]).split()[0])
-                            upload_speed = float(str(data["Upload"]).split()[0])
-                            ping_time = float(str(data.get("Ping", "0")).split()[0])
+                        download_speed, upload_speed, ping_time = self._parse_speedtest_result(data)
                         
                         self.internet_speed = {
                             "download": download_speed,
@@ -233,7 +409,9 @@ class ServiceMonitor:
                         }
                         
                         self.last_speed_test = datetime.now()
+                        self.speed_test_finished_at = time.monotonic()
                         self.speedtest_status = "Complete"
+                        self._speedtest_cmd = cmd
                         return  # Success, exit function
                     except Exception as e:
                         self.speedtest_error = f"JSON parse error: {e}"
@@ -267,12 +445,11 @@ class ServiceMonitor:
         if not self.speedtest_error:
             self.speedtest_error = "Speedtest command not found or not working"
     
-    def check_service_health(self, service_name: str) -> Dict:
+    def check_service_health(self, service_name: str) -> HealthResult:
         """Check individual service health with different validation methods"""
         service = self.services[service_name]
         try:
-            response = requests.get(service["url"], timeout=10)
-            response_time = f"{response.elapsed.total_seconds()*1000:.0f}ms"
+            response = self.http.get(service["url"], timeout=self.HTTP_TIMEOUT)
             
             # Handle different check types
             check_type = service.get("check_type", "http_status")
@@ -281,19 +458,19 @@ class ServiceMonitor:
                 # Just check HTTP status code
                 expected_status = service.get("expected_status", 200)
                 if response.status_code == expected_status:
-                    return {
-                        "status": "🟢 Healthy",
-                        "response_time": response_time,
-                        "uptime": self.get_container_uptime(service["container"]),
-                        "details": f"HTTP {response.status_code}"
-                    }
+                    return HealthResult(
+                        status="🟢 Healthy",
+                        response_time=_format_response_time(response),
+                        uptime=self.get_container_uptime(service["container"]),
+                        details=f"HTTP {response.status_code}"
+                    )
                 else:
-                    return {
-                        "status": "🔴 Down",
-                        "response_time": response_time,
-                        "uptime": "N/A",
-                        "details": f"HTTP {response.status_code} (expected {expected_status})"
-                    }
+                    return HealthResult(
+                        status="🔴 Down",
+                        response_time=_format_response_time(response),
+                        uptime="N/A",
+                        details=f"HTTP {response.status_code} (expected {expected_status})"
+                    )
                     
             elif check_type == "json_key":
                 # Check for specific key-value in JSON response
@@ -304,34 +481,34 @@ class ServiceMonitor:
                         expected_value = service.get("expected_value")
                         
                         if expected_key in data and data[expected_key] == expected_value:
-                            return {
-                                "status": "🟢 Healthy",
-                                "response_time": response_time,
-                                "uptime": self.get_container_uptime(service["container"]),
-                                "details": f"JSON OK: {expected_key}={data[expected_key]}"
-                            }
+                            return HealthResult(
+                                status="🟢 Healthy",
+                                response_time=_format_response_time(response),
+                                uptime=self.get_container_uptime(service["container"]),
+                                details=f"JSON OK: {expected_key}={data[expected_key]}"
+                            )
                         else:
                             actual_value = data.get(expected_key, "missing")
-                            return {
-                                "status": "🔴 Down",
-                                "response_time": response_time,
-                                "uptime": "N/A",
-                                "details": f"JSON fail: {expected_key}={actual_value} (expected {expected_value})"
-                            }
+                            return HealthResult(
+                                status="🔴 Down",
+                                response_time=_format_response_time(response),
+                                uptime="N/A",
+                                details=f"JSON fail: {expected_key}={actual_value} (expected {expected_value})"
+                            )
                     except ValueError:
-                        return {
-                            "status": "🔴 Down",
-                            "response_time": response_time,
-                            "uptime": "N/A",
-                            "details": "Invalid JSON response"
-                        }
+                        return HealthResult(
+                            status="🔴 Down",
+                            response_time=_format_response_time(response),
+                            uptime="N/A",
+                            details="Invalid JSON response"
+                        )
                 else:
-                    return {
-                        "status": "🔴 Down",
-                        "response_time": response_time,
-                        "uptime": "N/A",
-                        "details": f"HTTP {response.status_code}"
-                    }
+                    return HealthResult(
+                        status="🔴 Down",
+                        response_time=_format_response_time(response),
+                        uptime="N/A",
+                        details=f"HTTP {response.status_code}"
+                    )
                     
             elif check_type == "tailscale_device":
                 # Check Tailscale device status first, then service health
@@ -339,39 +516,39 @@ class ServiceMonitor:
                 device_status = self.check_tailscale_device(tailscale_name)
                 
                 if not device_status["online"]:
-                    return {
-                        "status": "🔴 Offline",
-                        "response_time": "N/A",
-                        "uptime": "N/A", 
-                        "details": f"Tailscale device offline: {device_status['status']}"
-                    }
+                    return HealthResult(
+                        status="🔴 Offline",
+                        response_time="N/A",
+                        uptime="N/A",
+                        details=f"Tailscale device offline: {device_status['status']}"
+                    )
                 
                 # Device is online, now check service health
                 if response.status_code == 200:
                     try:
                         # Try to parse as JSON for health check
                         data = response.json()
-                        return {
-                            "status": "🟢 Online + Service Healthy",
-                            "response_time": response_time,
-                            "uptime": device_status.get("uptime", "Unknown"),
-                            "details": f"Device online, service responding"
-                        }
+                        return HealthResult(
+                            status="🟢 Online + Service Healthy",
+                            response_time=_format_response_time(response),
+                            uptime=device_status.get("uptime", "Unknown"),
+                            details=f"Device online, service responding"
+                        )
                     except ValueError:
                         # Not JSON, but HTTP 200 is still good
-                        return {
-                            "status": "🟡 Online + Service Limited", 
-                            "response_time": response_time,
-                            "uptime": device_status.get("uptime", "Unknown"),
-                            "details": f"Device online, HTTP {response.status_code}"
-                        }
+                        return HealthResult(
+                            status="🟡 Online + Service Limited",
+                            response_time=_format_response_time(response),
+                            uptime=device_status.get("uptime", "Unknown"),
+                            details=f"Device online, HTTP {response.status_code}"
+                        )
                 else:
-                    return {
-                        "status": "🟡 Online + Service Down",
-                        "response_time": response_time,
-                        "uptime": device_status.get("uptime", "Unknown"), 
-                        "details": f"Device online, HTTP {response.status_code}"
-                    }
+                    return HealthResult(
+                        status="🟡 Online + Service Down",
+                        response_time=_format_response_time(response),
+                        uptime=device_status.get("uptime", "Unknown"),
+                        details=f"Device online, HTTP {response.status_code}"
+                    )
                     
         except requests.exceptions.RequestException as e:
             # For Tailscale devices, check device status even if service is unreachable
@@ -380,250 +557,330 @@ class ServiceMonitor:
                 device_status = self.check_tailscale_device(tailscale_name)
                 
                 if device_status["online"]:
-                    error_msg = str(e)
-                    if "timeout" in error_msg.lower():
+                    if isinstance(e, requests.exceptions.Timeout):
                         details = "Device online, service timeout"
-                    elif "connection" in error_msg.lower():
+                    elif isinstance(e, requests.exceptions.ConnectionError):
                         details = "Device online, service unreachable"
                     else:
-                        details = f"Device online, service error: {error_msg[:30]}"
+                        details = f"Device online, service error: {str(e)[:30]}"
                     
-                    return {
-                        "status": "🟡 Online + Service Down",
-                        "response_time": "N/A",
-                        "uptime": device_status.get("uptime", "Unknown"),
-                        "details": details
-                    }
+                    return HealthResult(
+                        status="🟡 Online + Service Down",
+                        response_time="N/A",
+                        uptime=device_status.get("uptime", "Unknown"),
+                        details=details
+                    )
                 else:
-                    return {
-                        "status": "🔴 Offline",
-                        "response_time": "N/A",
-                        "uptime": "N/A",
-                        "details": f"Tailscale device offline: {device_status['status']}"
-                    }
+                    return HealthResult(
+                        status="🔴 Offline",
+                        response_time="N/A",
+                        uptime="N/A",
+                        details=f"Tailscale device offline: {device_status['status']}"
+                    )
             
-            # Standard error handling for other services
-            error_msg = str(e)
+            # Standard error handling for other services. SSLError is a
+            # ConnectionError and ConnectTimeout is both, so order matters.
             is_remote = service.get("remote", False)
             node_name = service.get("node_name", "Unknown")
             
-            if "SSL" in error_msg or "ssl" in error_msg:
+            if isinstance(e, requests.exceptions.SSLError):
                 details = f"Funnel down ({node_name})" if is_remote else "SSL error"
-            elif "timeout" in error_msg.lower():
+            elif isinstance(e, requests.exceptions.Timeout):
                 details = f"Funnel timeout ({node_name})" if is_remote else "Connection timeout"
-            elif "connection" in error_msg.lower():
+            elif isinstance(e, requests.exceptions.ConnectionError):
                 details = f"Funnel offline ({node_name})" if is_remote else "Connection refused"
             else:
-                details = f"Unreachable ({node_name})" if is_remote else f"Network error: {error_msg[:30]}"
+                details = f"Unreachable ({node_name})" if is_remote else f"Network error: {str(e)[:30]}"
                 
-            return {
-                "status": "🔴 Down", 
-                "response_time": "N/A",
-                "uptime": "N/A",
-                "details": details
-            }
+            return HealthResult(
+                status="🔴 Down",
+                response_time="N/A",
+                uptime="N/A",
+                details=details
+            )
     
-    def get_container_uptime(self, container_name: str) -> str:
-        """Get Docker container uptime"""
-        commands_to_try = [
-            ["docker", "inspect", container_name, "--format", "{{.State.StartedAt}}"],
-            ["sudo", "docker", "inspect", container_name, "--format", "{{.State.StartedAt}}"]
-        ]
+    def check_all_services(self) -> Dict[str, HealthResult]:
+        """Check every service concurrently, in services order
+
+        A service that has not answered within HEALTH_CHECK_BUDGET is reported
+        as a timeout so one slow node cannot stall the whole refresh.
+        """
+        futures = {
+            name: self._health_executor.submit(self.check_service_health, name)
+            for name in self.services
+        }
+        done, _ = wait(futures.values(), timeout=self.HEALTH_CHECK_BUDGET)
         
-        for cmd in commands_to_try:
+        results = {}
+        for name, future in futures.items():
+            if future not in done:
+                details = "Health check timeout"
+            elif future.exception() is not None:
+                details = f"Check error: {str(future.exception())[:30]}"
+            else:
+                results[name] = future.result()
+                continue
+            results[name] = HealthResult(
+                status="🔴 Down",
+                response_time="N/A",
+                uptime="N/A",
+                details=details
+            )
+        return results
+    
+    def _refresh_docker_state(self) -> Dict[str, Dict]:
+        """Inspect every known container in one docker call, at most every DOCKER_STATE_TTL"""
+        with self._docker_state_lock:
+            now = time.monotonic()
+            if self._docker_state_at and now - self._docker_state_at < self.DOCKER_STATE_TTL:
+                return self._docker_state
+            
+            containers = set(self.WATCHED_CONTAINERS)
+            containers.update(service["container"] for service in self.services.values())
+            state = {}
             try:
+                # One JSON object per container; missing containers only add
+                # an error on stderr (and a non-zero exit), so parse stdout anyway
                 result = subprocess.run(
-                    cmd,
+                    [*self._docker_prefix, "inspect", "--format",
+                     '{"name":{{json .Name}},"state":{{json .State}}}', *sorted(containers)],
                     capture_output=True,
                     text=True,
-                    timeout=10
+                    timeout=self.DOCKER_INSPECT_TIMEOUT
                 )
-                if result.returncode == 0:
-                    start_time = datetime.fromisoformat(result.stdout.strip().replace('Z', '+00:00'))
-                    uptime = datetime.now().astimezone() - start_time.astimezone()
-                    
-                    days = uptime.days
-                    hours, remainder = divmod(uptime.seconds, 3600)
-                    minutes, _ = divmod(remainder, 60)
-                    
-                    if days > 0:
-                        return f"{days}d {hours}h {minutes}m"
-                    elif hours > 0:
-                        return f"{hours}h {minutes}m"
-                    else:
-                        return f"{minutes}m"
-                elif "permission denied" in result.stderr.lower() and cmd[0] != "sudo":
-                    continue  # Try with sudo
+                for line in result.stdout.splitlines():
+                    if line.strip():
+                        row = json_loads(line)
+                        state[row["name"].lstrip("/")] = row["state"]
             except Exception:
-                continue  # Try next command
-        return "Unknown"
+                pass
+            
+            self._docker_state = state
+            self._docker_state_at = now
+            return state
+    
+    def _get_container_started_at(self, container_name: str) -> Optional[datetime]:
+        """Get a container's StartedAt from the batched docker state"""
+        started_at = self._refresh_docker_state().get(container_name, {}).get("StartedAt")
+        if not started_at:
+            return None
+        try:
+            # Docker reports nanoseconds; fromisoformat only takes microseconds
+            head, _, frac = started_at.rstrip('Z').partition('.')
+            return datetime.fromisoformat(f"{head}.{frac[:6].ljust(6, '0')}+00:00")
+        except ValueError:
+            return None
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking check in the loop's default executor"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def check_internet_connection_async(self) -> Dict:
+        """check_internet_connection without blocking the event loop"""
+        return await self._run_blocking(self.check_internet_connection)
+    
+    async def fetch_hive_stats_async(self) -> Dict:
+        """fetch_hive_stats without blocking the event loop"""
+        return await self._run_blocking(self.fetch_hive_stats)
+    
+    def get_container_uptime(self, container_name: str) -> str:
+        """Get Docker container uptime"""
+        start_time = self._get_container_started_at(container_name)
+        if start_time is None:
+            return "Unknown"
+        
+        # StartedAt is UTC, so compare in UTC without probing the local timezone
+        uptime = datetime.now(timezone.utc) - start_time
+        
+        days = uptime.days
+        hours, remainder = divmod(uptime.seconds, 3600)
+        minutes, _ = divmod(remainder, 60)
+        
+        if days > 0:
+            return f"{days}d {hours}h {minutes}m"
+        elif hours > 0:
+            return f"{hours}h {minutes}m"
+        else:
+            return f"{minutes}m"
     
     def get_recent_logs(self, container_name: str, lines: int = 5) -> List[str]:
-        """Get recent container logs"""
-        # Try without sudo first, then with sudo if permission denied
-        commands_to_try = [
-            ["docker", "logs", "--tail", str(lines), container_name],
-            ["sudo", "docker", "logs", "--tail", str(lines), container_name]
-        ]
+        """Get recent container logs
+
+        The first call reads the last `lines` lines with --tail; later calls
+        only ask Docker for lines written since the newest line already read
+        and append them to the cached tail.
+        """
+        buffer = self._log_buffers.get(container_name)
+        since = self._last_log_time.get(container_name)
+        if buffer is None or buffer.maxlen != lines or since is None:
+            buffer = deque(maxlen=lines)
+            since = None
+            log_args = ["--tail", str(lines)]
+        else:
+            log_args = ["--since", since]
         
-        for cmd in commands_to_try:
+        try:
+            result = subprocess.run(
+                [*self._docker_prefix, "logs", "--timestamps", *log_args, container_name],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode == 0:
+                # Each line is prefixed with its timestamp. --since is inclusive, so
+                # lines at or before the cursor were returned by the previous read
+                since_key = log_time_key(since) if since else ""
+                newest, newest_key = since, since_key
+                entries = []
+                for line in chain(result.stdout.splitlines(), result.stderr.splitlines()):
+                    stamp, _, log = line.partition(" ")
+                    key = log_time_key(stamp)
+                    if key <= since_key:
+                        continue
+                    if key > newest_key:
+                        newest, newest_key = stamp, key
+                    if log.strip():
+                        entries.append((key, log))
+                
+                # Containers log to both streams; merge them back into time order.
+                # The deque keeps only the last `lines`
+                entries.sort(key=itemgetter(0))
+                buffer.extend(log for _, log in entries)
+                self._log_buffers[container_name] = buffer
+                if newest:
+                    self._last_log_time[container_name] = newest
+                if buffer:
+                    return list(buffer)
+                else:
+                    return [f"Container '{container_name}' has no recent logs"]
+            else:
+                return [f"Error getting logs (code {result.returncode}): {result.stderr.strip()}"]
+        except subprocess.TimeoutExpired:
+            return [f"Timeout getting logs for {container_name}"]
+        except Exception as e:
+            return [f"Error: {str(e)}"]
+    
+    def _tailscale_snapshot(self):
+        """Return (peers by hostname, error status), refreshed at most every TAILSCALE_CACHE_TTL"""
+        with self._tailscale_lock:
+            fetched_at, peers, error = self._tailscale_cache
+            now = time.monotonic()
+            if fetched_at and now - fetched_at < self.TAILSCALE_CACHE_TTL:
+                return peers, error
+            
+            peers, error = {}, None
             try:
                 result = subprocess.run(
-                    cmd,
+                    ["tailscale", "status", "--json"],
                     capture_output=True,
-                    text=True,
                     timeout=10
                 )
-                if result.returncode == 0:
-                    logs = result.stdout.strip().split('\n')
-                    # Also check stderr for logs
-                    if result.stderr.strip():
-                        stderr_logs = result.stderr.strip().split('\n')
-                        logs.extend(stderr_logs)
-                    
-                    valid_logs = [log for log in logs if log.strip()]
-                    if valid_logs:
-                        return valid_logs
-                    else:
-                        return [f"Container '{container_name}' has no recent logs"]
-                elif "permission denied" in result.stderr.lower() and cmd[0] != "sudo":
-                    continue  # Try with sudo
+                if result.returncode != 0:
+                    error = "tailscale command failed"
                 else:
-                    return [f"Error getting logs (code {result.returncode}): {result.stderr.strip()}"]
+                    # Parse Tailscale JSON status (raw bytes, no decode step)
+                    tailscale_data = json_loads(result.stdout)
+                    peers = {
+                        peer_info.get("HostName"): peer_info
+                        for peer_info in tailscale_data.get("Peer", {}).values()
+                    }
             except subprocess.TimeoutExpired:
-                return [f"Timeout getting logs for {container_name}"]
+                error = "tailscale status timeout"
             except Exception as e:
-                if "permission denied" in str(e).lower() and cmd[0] != "sudo":
-                    continue  # Try with sudo
-                return [f"Error: {str(e)}"]
-        
-        return ["No logs available"]
+                error = f"error checking tailscale: {str(e)[:50]}"
+            
+            self._tailscale_cache = (now, peers, error)
+            return peers, error
     
     def check_tailscale_device(self, device_name: str) -> Dict:
         """Check if a Tailscale device is online and get its status"""
-        try:
-            result = subprocess.run(
-                ["tailscale", "status", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return {
-                    "online": False,
-                    "status": "tailscale command failed",
-                    "uptime": "N/A"
-                }
-            
-            # Parse Tailscale JSON status
-            import json
-            tailscale_data = json.loads(result.stdout)
-            
-            # Look for the device in the peer list
-            for peer_id, peer_info in tailscale_data.get("Peer", {}).items():
-                if peer_info.get("HostName") == device_name:
-                    online = peer_info.get("Online", False)
-                    last_seen = peer_info.get("LastSeen")
-                    
-                    if online:
-                        return {
-                            "online": True,
-                            "status": "active",
-                            "uptime": "Active",
-                            "last_seen": last_seen
-                        }
-                    else:
-                        return {
-                            "online": False,
-                            "status": "offline",
-                            "uptime": "N/A",
-                            "last_seen": last_seen
-                        }
-            
-            # Device not found in peer list
+        peers, error = self._tailscale_snapshot()
+        if error:
             return {
                 "online": False,
-                "status": "device not found in tailscale network",
+                "status": error,
                 "uptime": "N/A"
             }
-            
-        except subprocess.TimeoutExpired:
+        
+        peer_info = peers.get(device_name)
+        if peer_info is None:
+            # Device not found in peer list
             return {
                 "online": False,
-                "status": "tailscale status timeout",
+                "status": "device not found in tailscale network",
                 "uptime": "N/A"
             }
-        except Exception as e:
+        
+        last_seen = peer_info.get("LastSeen")
+        if peer_info.get("Online", False):
             return {
-                "online": False,
-                "status": f"error checking tailscale: {str(e)[:50]}",
-                "uptime": "N/A"
+                "online": True,
+                "status": "active",
+                "uptime": "Active",
+                "last_seen": last_seen
             }
+        return {
+            "online": False,
+            "status": "offline",
+            "uptime": "N/A",
+            "last_seen": last_seen
+        }
     
     def get_docker_stats(self) -> Dict:
         """Get Docker container resource usage"""
         stats = {}
         
-        # Get CPU stats from docker stats
-        commands_to_try = [
-            ["docker", "stats", "--no-stream", "--format", 
-             "table {{.Name}}\t{{.CPUPerc}}\t{{.MemUsage}}\t{{.NetIO}}"],
-            ["sudo", "docker", "stats", "--no-stream", "--format", 
-             "table {{.Name}}\t{{.CPUPerc}}\t{{.MemUsage}}\t{{.NetIO}}"]
-        ]
-        
-        for cmd in commands_to_try:
-            try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=15
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                    for line in lines:
-                        parts = line.split('\t')
-                        if len(parts) >= 3:
-                            container = parts[0]
-                            if container in ["video-worker", "ytipfs-worker"]:
-                                # Get CPU percentage
-                                cpu_percent = parts[1]
-                                
-                                # Get memory usage - if it's 0B / 0B, get actual usage
-                                mem_usage = parts[2]
-                                if mem_usage == "0B / 0B" or "0B" in mem_usage:
-                                    mem_usage = self._get_container_memory_usage(container)
-                                else:
-                                    mem_usage = mem_usage.split(' / ')[0]  # Just the used part
-                                
-                                stats[container] = {
-                                    "cpu": cpu_percent,
-                                    "memory": mem_usage,
-                                    "network": parts[3] if len(parts) > 3 else "N/A"
-                                }
-                    break  # Success, don't try with sudo
-                elif "permission denied" in result.stderr.lower() and cmd[0] != "sudo":
-                    continue  # Try with sudo
-            except subprocess.TimeoutExpired:
-                continue  # Try next command
-            except Exception:
-                continue  # Try next command
+        # Get CPU/memory/network from docker stats, only for the containers we watch
+        try:
+            result = subprocess.run(
+                [*self._docker_prefix, "stats", "--no-stream", "--format", "{{json .}}", *self.WATCHED_CONTAINERS],
+                capture_output=True,
+                text=True,
+                timeout=15
+            )
+            # One JSON object per container; a missing or stopped container only
+            # adds an error on stderr (and a non-zero exit), so parse stdout anyway
+            for line in result.stdout.splitlines():
+                if not line.strip():
+                    continue
+                row = json_loads(line)
+                container = row.get("Name", "")
+                
+                # Get memory usage - if it's 0B / 0B, get actual usage
+                mem_usage = row.get("MemUsage", "")
+                if not mem_usage or "0B" in mem_usage:
+                    mem_usage = self._get_container_memory_usage(container)
+                else:
+                    mem_usage = mem_usage.split(' / ', 1)[0]  # Just the used part
+                
+                stats[container] = {
+                    "cpu": row.get("CPUPerc", "N/A"),
+                    "memory": mem_usage,
+                    "network": row.get("NetIO", "N/A")
+                }
+        except Exception:
+            pass
         
         return stats
 
     def _get_container_memory_usage(self, container_name: str) -> str:
         """Get actual memory usage from container when Docker stats shows 0B"""
         try:
-            # Get the main process ID of the container
-            cmd = ["docker", "inspect", container_name, "--format", "{{.State.Pid}}"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            # Main process ID of the container, from the batched docker inspect
+            pid = self._refresh_docker_state().get(container_name, {}).get("Pid")
             
-            if result.returncode == 0 and result.stdout.strip().isdigit():
-                pid = result.stdout.strip()
+            if pid:
+                # Fast path: /proc/PID/statm is "size resident shared ..." in pages
+                try:
+                    with open(f"/proc/{pid}/statm", "rb", buffering=0) as f:
+                        buf = f.read(64)
+                    start = buf.index(b" ") + 1
+                    resident_pages = int(buf[start:buf.index(b" ", start)])
+                    return self._format_bytes(resident_pages * self._page_size)
+                except:
+                    pass
                 
-                # Get memory usage from /proc/PID/status
+                # Alternative: VmRSS from /proc/PID/status
                 try:
                     with open(f"/proc/{pid}/status", "r") as f:
                         for line in f:
@@ -632,19 +889,6 @@ class ServiceMonitor:
                                 return self._format_bytes(mem_kb * 1024)  # Convert KB to bytes
                 except:
                     pass
-                
-                # Alternative: use /proc/PID/statm
-                try:
-                    with open(f"/proc/{pid}/statm", "r") as f:
-                        # statm format: size resident shared text lib data dt
-                        statm = f.read().split()
-                        if len(statm) >= 2:
-                            resident_pages = int(statm[1])
-                            page_size = 4096  # Standard page size
-                            memory_bytes = resident_pages * page_size
-                            return self._format_bytes(memory_bytes)
-                except:
-                    pass
         except:
             pass
             
@@ -652,11 +896,9 @@ class ServiceMonitor:
     
     def _format_bytes(self, bytes_value: int) -> str:
         """Format bytes into human readable format"""
-        if bytes_value >= 1024 * 1024 * 1024:  # GB
-            return f"{bytes_value / (1024 * 1024 * 1024):.1f}GB"
-        elif bytes_value >= 1024 * 1024:  # MB
-            return f"{bytes_value / (1024 * 1024):.1f}MB"
-        elif bytes_value >= 1024:  # KB
-            return f"{bytes_value / 1024:.1f}KB"
-        else:
-            return f"{bytes_value}B"
+        # The magnitude comes from the bit length instead of a compare chain
+        bit_length = int(bytes_value).bit_length()
+        for shift, unit in self._BYTE_UNITS:
+            if bit_length > shift:
+                return f"{bytes_value / (1 << shift):.1f}{unit}"
+        return f"{bytes_value}B"
@@ -6,9 +6,10 @@ Aggregates video transcoding logs from all services: Mac Mini, Raspberry Pi, and
 
 import requests
 import asyncio
+import heapq
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Optional
-import json
 import sys
 from pathlib import Path
 
@@ -18,6 +19,11 @@ from config import (
     SKATEHIVE_NODES,
     VIDEO_FUNNEL_PATH,
 )
+from utils.http import json_loads, session
+from utils.timestamps import parse_timestamp
+
+# Overall budget for one service's fetch + decode, in seconds
+FETCH_BUDGET = 8
 
 
 class UnifiedVideoActivityMonitor:
@@ -56,29 +62,42 @@ class UnifiedVideoActivityMonitor:
         self.service_status = {}
         self.last_update = None
         
+    @staticmethod
+    def _get_logs(endpoint: str):
+        """Fetch and decode a service's log payload; returns None on a non-200 response"""
+        response = session.get(
+            endpoint,
+            timeout=FETCH_BUDGET,  # Keeps the worker thread from outliving the budget
+            params={"limit": 10}  # Get last 10 operations
+        )
+        if response.status_code != 200:
+            return None
+        return json_loads(response.content)
+    
     async def fetch_service_logs(self, service_key: str, service_config: Dict) -> List[Dict]:
         """Fetch logs from a specific video service"""
         try:
-            response = requests.get(
-                service_config["endpoint"], 
-                timeout=8,
-                params={"limit": 10}  # Get last 10 operations
+            # Bound the whole fetch + decode, not just the socket phases, and run
+            # it in a worker thread so the gather in update_unified_logs overlaps
+            data = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    None, self._get_logs, service_config["endpoint"]
+                ),
+                timeout=FETCH_BUDGET
             )
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 logs = data.get('logs', []) if isinstance(data, dict) else data
                 
-                # Add service metadata to each log entry
+                # Tag each entry with its service key; name/icon/color stay in
+                # video_services. The decoded payload is ours, so no copy is needed
                 enriched_logs = []
                 for log in logs:
                     if isinstance(log, dict):
-                        enriched_log = log.copy()
-                        enriched_log['service'] = service_key
-                        enriched_log['service_name'] = service_config['name']
-                        enriched_log['service_icon'] = service_config['icon']
-                        enriched_log['service_color'] = service_config['color']
-                        enriched_logs.append(enriched_log)
+                        log['service'] = service_key
+                        # Parsed once here so sorting and age checks compare floats
+                        log['_ts'] = parse_timestamp(log.get('timestamp'))
+                        enriched_logs.append(log)
                 
                 self.service_status[service_key] = {
                     "status": "online",
@@ -94,6 +113,12 @@ class UnifiedVideoActivityMonitor:
                 "error": "Connection timeout",
                 "last_seen": None
             }
+        except (asyncio.TimeoutError, requests.exceptions.Timeout):
+            self.service_status[service_key] = {
+                "status": "timeout",
+                "error": "Request timeout",
+                "last_seen": None
+            }
         except requests.exceptions.ConnectionError:
             self.service_status[service_key] = {
                 "status": "offline", 
@@ -127,29 +152,8 @@ class UnifiedVideoActivityMonitor:
             if isinstance(result, list):
                 all_logs.extend(result)
         
-        # Sort by timestamp (newest first) with detailed error handling
-        def safe_timestamp_sort(log):
-            timestamp = log.get('timestamp', '')
-            if not timestamp:
-                return '1970-01-01T00:00:00Z'  # Default very old timestamp
-            if not isinstance(timestamp, str):
-                # Convert non-string timestamps to string
-                return str(timestamp)
-            return timestamp
-        
-        try:
-            all_logs.sort(key=safe_timestamp_sort, reverse=True)
-        except Exception as e:
-            # If sorting still fails, log the error and use unsorted logs
-            print(f"Warning: Failed to sort logs: {e}")
-            # Try to identify problematic log entries
-            for i, log in enumerate(all_logs):
-                ts = log.get('timestamp', 'MISSING')
-                print(f"Log {i}: timestamp={ts}, type={type(ts)}")
-            # Continue with unsorted logs
-        
-        # Keep last 20 operations across all services
-        self.unified_logs = all_logs[:20]
+        # Keep the 20 newest operations across all services; unparseable timestamps rank last
+        self.unified_logs = heapq.nlargest(20, all_logs, key=itemgetter('_ts'))
         self.last_update = datetime.now()
         
         return {
@@ -166,7 +170,8 @@ class UnifiedVideoActivityMonitor:
             "logs": self.unified_logs,
             "service_status": self.service_status,
             "last_update": self.last_update.isoformat() if self.last_update else None,
-            "summary": self.get_activity_summary()
+            "summary": self.get_activity_summary(),
+            "service_meta": self.video_services
         }
     
     def get_activity_summary(self) -> Dict:
@@ -180,13 +185,20 @@ class UnifiedVideoActivityMonitor:
                 "services_active": 0
             }
         
-        # Count operations by status
-        successful = len([log for log in self.unified_logs if log.get('status') == 'completed'])
-        failed = len([log for log in self.unified_logs if log.get('status') == 'failed'])
+        # Count operations by status and active services (those with recent logs) in one pass
+        successful = failed = 0
+        services = set()
+        for log in self.unified_logs:
+            status = log.get('status')
+            if status == 'completed':
+                successful += 1
+            elif status == 'failed':
+                failed += 1
+            service = log.get('service')
+            if service:
+                services.add(service)
         total = len(self.unified_logs)
-        
-        # Count active services (services that have recent logs)
-        active_services = len(set(log.get('service') for log in self.unified_logs if log.get('service')))
+        active_services = len(services)
         
         success_rate = (successful / total * 100) if total > 0 else 0
         
@@ -4,9 +4,13 @@ Enhanced Error Tracking for Dashboard Services
 Provides better error capture, storage, and display functionality
 """
 
-import json
-import requests
-from datetime import datetime, timedelta
+import heapq
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Dict, List, Optional
 from rich.panel import Panel
 from rich.table import Table
@@ -24,6 +28,70 @@ from config import (
     VIDEO_FUNNEL_PATH,
     INSTAGRAM_FUNNEL_PATH,
 )
+from utils.http import json_loads, session
+from utils.timestamps import parse_timestamp
+
+# Instagram post ID from a /p/<id>/ URL
+_POST_ID_RE = re.compile(r'/p/([^/?#]+)')
+
+# Routed to a file by the dashboard; printing would corrupt the Live display
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched log/error list is reused across dashboard repaints
+FETCH_CACHE_TTL = 2.0
+
+# (kind, url) -> (monotonic fetch time, result)
+_fetch_cache: Dict[tuple, tuple] = {}
+
+
+def _cached_fetch(key: tuple, fetch, force: bool = False):
+    """Return the cached result for key while it is younger than FETCH_CACHE_TTL, else refetch"""
+    now = time.monotonic()
+    hit = _fetch_cache.get(key)
+    if not force and hit and now - hit[0] < FETCH_CACHE_TTL:
+        return hit[1]
+    
+    result = fetch()
+    _fetch_cache[key] = (now, result)
+    return result
+
+
+def _to_video_error_record(log: Dict) -> Optional[Dict]:
+    """Map a video transcoder log entry to an error record, or None if it is not an error"""
+    status = log.get('status', '')
+    if status not in ('failed', 'error'):
+        return None
+    return {
+        'timestamp': log.get('timestamp', ''),
+        '_ts': parse_timestamp(log.get('timestamp')),
+        'user': log.get('user', 'unknown'),
+        'filename': log.get('filename', 'unknown'),
+        'error': log.get('error', 'Unknown error'),
+        'status': status,
+        'duration': log.get('duration', 0),
+        'device': log.get('device', 'unknown')
+    }
+
+
+def _to_instagram_error_record(log: Dict) -> Optional[Dict]:
+    """Map an Instagram downloader log entry to an error record, or None if it is not an error"""
+    status = log.get('status', '')
+    if status != 'failed' and log.get('success', True):
+        return None
+    return {
+        'timestamp': log.get('timestamp', ''),
+        '_ts': parse_timestamp(log.get('timestamp')),
+        'url': log.get('url', 'unknown'),
+        'filename': log.get('filename', 'unknown'),
+        'error': log.get('error', log.get('message', 'Unknown error')),
+        'status': status,
+        'duration': log.get('duration', 0)
+    }
+
+
+def _count_recent(errors: List[Dict], cutoff: float) -> int:
+    """Count error records whose cached epoch timestamp is newer than cutoff"""
+    return sum(1 for e in errors if e['_ts'] > cutoff)
 
 
 class ErrorTracker:
@@ -39,105 +107,73 @@ class ErrorTracker:
             'video_transcoder': None,
             'instagram_downloader': None
         }
+        # Both services are fetched side by side for each summary
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="error-tracker")
     
-    def get_video_transcoder_errors(self) -> List[Dict]:
+    def get_video_transcoder_errors(self, force: bool = False) -> List[Dict]:
         """Get recent errors from video transcoder"""
+        url = f"{self.base_url}{VIDEO_FUNNEL_PATH}/logs"
+        return _cached_fetch(("errors", url), lambda: self._fetch_video_transcoder_errors(url), force)
+    
+    def _fetch_video_transcoder_errors(self, url: str) -> List[Dict]:
+        """Fetch and filter video transcoder logs down to errors"""
         try:
-            response = requests.get(f"{self.base_url}{VIDEO_FUNNEL_PATH}/logs", timeout=10)
+            response = session.get(url, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 logs = data.get('logs', [])  # Fix: Extract logs array from response
-                errors = []
                 
-                for log in logs:
-                    status = log.get('status', '')
-                    if status in ['failed', 'error']:
-                        error_data = {
-                            'timestamp': log.get('timestamp', ''),
-                            'user': log.get('user', 'unknown'),
-                            'filename': log.get('filename', 'unknown'),
-                            'error': log.get('error', 'Unknown error'),
-                            'status': status,
-                            'duration': log.get('duration', 0),
-                            'device': log.get('device', 'unknown')
-                        }
-                        errors.append(error_data)
-                
-                # Sort by timestamp (newest first)
-                errors.sort(key=lambda x: x['timestamp'], reverse=True)
-                self.error_cache['video_transcoder'] = errors[:20]  # Keep last 20 errors
+                # Keep the 20 newest errors without building the full filtered list
+                errors = heapq.nlargest(
+                    20, filter(None, map(_to_video_error_record, logs)), key=itemgetter('_ts')
+                )
+                self.error_cache['video_transcoder'] = errors
                 self.last_error_check['video_transcoder'] = datetime.now()
                 return errors[:10]  # Return last 10 for display
                 
         except Exception as e:
-            print(f"Error fetching video transcoder errors: {e}")
+            logger.warning("Error fetching video transcoder errors: %s", e)
         
         return []
     
-    def get_instagram_downloader_errors(self) -> List[Dict]:
+    def get_instagram_downloader_errors(self, force: bool = False) -> List[Dict]:
         """Get recent errors from Instagram downloader"""
+        url = f"{self.base_url}{INSTAGRAM_FUNNEL_PATH}/logs"
+        return _cached_fetch(("errors", url), lambda: self._fetch_instagram_downloader_errors(url), force)
+    
+    def _fetch_instagram_downloader_errors(self, url: str) -> List[Dict]:
+        """Fetch and filter Instagram downloader logs down to errors"""
         try:
-            response = requests.get(f"{self.base_url}{INSTAGRAM_FUNNEL_PATH}/logs", timeout=10)
+            response = session.get(url, timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 logs = data.get('logs', [])
-                errors = []
                 
-                for log in logs:
-                    status = log.get('status', '')
-                    success = log.get('success', True)
-                    
-                    if status == 'failed' or not success:
-                        error_data = {
-                            'timestamp': log.get('timestamp', ''),
-                            'url': log.get('url', 'unknown'),
-                            'filename': log.get('filename', 'unknown'),
-                            'error': log.get('error', log.get('message', 'Unknown error')),
-                            'status': status,
-                            'duration': log.get('duration', 0)
-                        }
-                        errors.append(error_data)
-                
-                # Sort by timestamp (newest first)
-                errors.sort(key=lambda x: x['timestamp'], reverse=True)
-                self.error_cache['instagram_downloader'] = errors[:20]  # Keep last 20 errors
+                # Keep the 20 newest errors without building the full filtered list
+                errors = heapq.nlargest(
+                    20, filter(None, map(_to_instagram_error_record, logs)), key=itemgetter('_ts')
+                )
+                self.error_cache['instagram_downloader'] = errors
                 self.last_error_check['instagram_downloader'] = datetime.now()
                 return errors[:10]  # Return last 10 for display
                 
         except Exception as e:
-            print(f"Error fetching Instagram downloader errors: {e}")
+            logger.warning("Error fetching Instagram downloader errors: %s", e)
         
         return []
     
     def get_error_summary(self) -> Dict:
         """Get a summary of recent errors for both services"""
-        video_errors = self.get_video_transcoder_errors()
+        # Fetch both services concurrently; latency is the slower endpoint, not the sum
+        video_future = self._executor.submit(self.get_video_transcoder_errors)
         instagram_errors = self.get_instagram_downloader_errors()
+        video_errors = video_future.result()
         
         # Count errors in the last 24 hours
-        now = datetime.now()
-        cutoff = now - timedelta(hours=24)
-        
-        recent_video_errors = 0
-        recent_instagram_errors = 0
+        cutoff = time.time() - 24 * 3600
         
-        for error in video_errors:
-            try:
-                if error['timestamp']:
-                    error_time = datetime.fromisoformat(error['timestamp'].replace('Z', '+00:00'))
-                    if error_time.replace(tzinfo=None) > cutoff:
-                        recent_video_errors += 1
-            except:
-                continue
-        
-        for error in instagram_errors:
-            try:
-                if error['timestamp']:
-                    error_time = datetime.fromisoformat(error['timestamp'].replace('Z', '+00:00'))
-                    if error_time.replace(tzinfo=None) > cutoff:
-                        recent_instagram_errors += 1
-            except:
-                continue
+        recent_video_errors = _count_recent(video_errors, cutoff)
+        recent_instagram_errors = _count_recent(instagram_errors, cutoff)
         
         return {
             'video_transcoder': {
@@ -167,10 +203,7 @@ class ErrorTracker:
         if video_summary['latest_errors']:
             latest = video_summary['latest_errors'][0]
             error_msg = latest['error'][:37] + "..." if len(latest['error']) > 40 else latest['error']
-            try:
-                time_str = datetime.fromisoformat(latest['timestamp'].replace('Z', '+00:00')).strftime('%H:%M:%S')
-            except:
-                time_str = "Unknown"
+            time_str = datetime.fromtimestamp(latest['_ts'], timezone.utc).strftime('%H:%M:%S') if latest['_ts'] else "Unknown"
             
             table.add_row(
                 "📹 Video Transcoder",
@@ -186,10 +219,7 @@ class ErrorTracker:
         if instagram_summary['latest_errors']:
             latest = instagram_summary['latest_errors'][0]
             error_msg = latest['error'][:37] + "..." if len(latest['error']) > 40 else latest['error']
-            try:
-                time_str = datetime.fromisoformat(latest['timestamp'].replace('Z', '+00:00')).strftime('%H:%M:%S')
-            except:
-                time_str = "Unknown"
+            time_str = datetime.fromtimestamp(latest['_ts'], timezone.utc).strftime('%H:%M:%S') if latest['_ts'] else "Unknown"
             
             table.add_row(
                 "📱 Instagram Downloader",
@@ -220,6 +250,28 @@ class ErrorTracker:
 error_tracker = ErrorTracker()
 
 
+# Runs the video health probe while the panel thread probes Instagram
+_health_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="error-monitor-health")
+
+
+def _is_healthy(url: str) -> bool:
+    """Return True when a service health endpoint answers 200"""
+    try:
+        return session.get(url, timeout=5).status_code == 200
+    except Exception:
+        return False
+
+
+def _make_status_table() -> Table:
+    """Build an empty service status table; rows are filled in per refresh"""
+    table = Table(show_header=True, header_style="bold cyan", box=box.ROUNDED)
+    table.add_column("Service", style="cyan", width=14)
+    table.add_column("Status", style="green", width=8)
+    table.add_column("Last Activity", style="yellow", width=25)
+    table.add_column("Issues", style="red", width=8)
+    return table
+
+
 def create_error_monitor_panel(monitor) -> Panel:
     """Create the error monitoring panel for the dashboard"""
     try:
@@ -228,14 +280,10 @@ def create_error_monitor_panel(monitor) -> Panel:
         instagram_activity = get_recent_instagram_activity()
         
         # Create a more informative panel
-        table = Table(show_header=True, header_style="bold cyan", box=box.ROUNDED)
-        table.add_column("Service", style="cyan", width=14)
-        table.add_column("Status", style="green", width=8)
-        table.add_column("Last Activity", style="yellow", width=25)
-        table.add_column("Issues", style="red", width=8)
+        table = _make_status_table()
         
         # Video Transcoder Status
-        video_issues = len([a for a in video_activity if a.get('status') == 'failed'])
+        video_issues = sum(1 for a in video_activity if a.get('status') == 'failed')
         video_status = "🔴 Issues" if video_issues > 0 else "🟢 OK"
         video_last = video_activity[0] if video_activity else None
         video_activity_str = "No recent activity"
@@ -245,11 +293,11 @@ def create_error_monitor_panel(monitor) -> Panel:
             user = video_last.get('user', 'unknown')
             status = video_last.get('status', 'unknown')
             
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%H:%M:%S')
-            except:
-                time_str = timestamp[-8:] if len(timestamp) >= 8 else 'unknown'
+            ts = video_last['_ts']
+            if ts:
+                time_str = datetime.fromtimestamp(ts, timezone.utc).strftime('%H:%M:%S')
+            else:
+                time_str = (timestamp or 'unknown')[-8:]
             
             video_activity_str = f"{time_str} {user} ({status})"
         
@@ -261,7 +309,7 @@ def create_error_monitor_panel(monitor) -> Panel:
         )
         
         # Instagram Downloader Status
-        instagram_issues = len([a for a in instagram_activity if not a.get('success', True)])
+        instagram_issues = sum(1 for a in instagram_activity if not a.get('success', True))
         instagram_status = "🔴 Issues" if instagram_issues > 0 else "🟢 OK"
         instagram_last = instagram_activity[0] if instagram_activity else None
         instagram_activity_str = "No recent activity"
@@ -271,16 +319,15 @@ def create_error_monitor_panel(monitor) -> Panel:
             url = instagram_last.get('url', 'unknown')
             status = instagram_last.get('status', 'unknown')
             
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%H:%M:%S')
-            except:
-                time_str = timestamp[-8:] if len(timestamp) >= 8 else 'unknown'
+            ts = instagram_last['_ts']
+            if ts:
+                time_str = datetime.fromtimestamp(ts, timezone.utc).strftime('%H:%M:%S')
+            else:
+                time_str = (timestamp or 'unknown')[-8:]
             
             # Extract post ID from URL
-            post_id = "unknown"
-            if '/p/' in url:
-                post_id = url.split('/p/')[-1].split('/')[0][:8]
+            match = _POST_ID_RE.search(url)
+            post_id = match.group(1)[:8] if match else "unknown"
             
             instagram_activity_str = f"{time_str} {post_id} ({status})"
         
@@ -292,18 +339,10 @@ def create_error_monitor_panel(monitor) -> Panel:
         )
         
         # System Health
-        system_issues = 0
-        try:
-            # Check if services are responding using config URLs
-            video_health = requests.get(f"{VIDEO_EXTERNAL_URL}/healthz", timeout=5)
-            instagram_health = requests.get(f"{INSTAGRAM_EXTERNAL_URL}/health", timeout=5)
-            
-            if video_health.status_code != 200:
-                system_issues += 1
-            if instagram_health.status_code != 200:
-                system_issues += 1
-        except:
-            system_issues += 1
+        # Check if services are responding using config URLs; both probes run concurrently
+        video_health = _health_executor.submit(_is_healthy, f"{VIDEO_EXTERNAL_URL}/healthz")
+        instagram_healthy = _is_healthy(f"{INSTAGRAM_EXTERNAL_URL}/health")
+        system_issues = (not video_health.result()) + (not instagram_healthy)
         
         system_status = "🔴 Issues" if system_issues > 0 else "🟢 OK"
         system_activity = "All services responding" if system_issues == 0 else f"{system_issues} services down"
@@ -339,27 +378,28 @@ def create_error_monitor_panel(monitor) -> Panel:
         )
 
 
-def get_recent_video_activity():
+def get_recent_video_activity(force: bool = False):
     """Get recent video transcoder activity"""
-    try:
-        response = requests.get(f"{VIDEO_EXTERNAL_URL}/logs", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            logs = data.get('logs', [])
-            return logs[:10]  # Last 10 activities
-    except:
-        pass
-    return []
+    url = f"{VIDEO_EXTERNAL_URL}/logs"
+    return _cached_fetch(("activity", url), lambda: _fetch_recent_activity(url), force)
 
 
-def get_recent_instagram_activity():
+def get_recent_instagram_activity(force: bool = False):
     """Get recent Instagram downloader activity"""
+    url = f"{INSTAGRAM_EXTERNAL_URL}/logs"
+    return _cached_fetch(("activity", url), lambda: _fetch_recent_activity(url), force)
+
+
+def _fetch_recent_activity(url: str):
+    """Fetch the last 10 activity entries from a service's logs endpoint"""
     try:
-        response = requests.get(f"{INSTAGRAM_EXTERNAL_URL}/logs", timeout=5)
+        response = session.get(url, timeout=5)
         if response.status_code == 200:
-            data = response.json()
-            logs = data.get('logs', [])
-            return logs[:10]  # Last 10 activities
+            data = json_loads(response.content)
+            logs = data.get('logs', [])[:10]  # Last 10 activities
+            for log in logs:
+                log['_ts'] = parse_timestamp(log.get('timestamp'))
+            return logs
     except:
         pass
     return []
@@ -4,62 +4,102 @@ Hive Community Stats Panel
 Displays statistics from the Hive blockchain community API
 """
 
-from datetime import datetime
+import time
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 
-def create_hive_stats_panel(monitor) -> Panel:
-    """Create Hive community stats panel"""
+# Last rendered panel and the (stats version, age in minutes, error) it was built from
+_last_panel_key = None
+_last_panel = None
+
+
+def _fmt_count(value) -> str:
+    """Format an integer stat with thousands separators; pass anything else through as text"""
+    if value is None:
+        return 'N/A'
+    return f"{value:,}" if isinstance(value, int) else str(value)
+
+
+def _fmt_hbd(value) -> str:
+    """Format a payout total as whole HBD"""
+    try:
+        return f"{float(value if value is not None else 0):,.0f} HBD"
+    except (ValueError, TypeError):
+        return f"{value} HBD"
+
+
+# (row label, stats key, formatter) in display order; labels are plain Text
+# built once so Rich does not re-parse them as markup on every render
+_ROWS = tuple(
+    (Text(label), key, fmt)
+    for label, key, fmt in (
+        ("👥 Subscribers", "total_subscribers", _fmt_count),
+        ("📝 Posts", "total_posts", _fmt_count),
+        ("💬 Comments", "total_comments", _fmt_count),
+        ("✍️ Authors (30d)", "unique_post_authors_last_30_days", _fmt_count),
+        ("💭 Users (30d)", "unique_comment_authors_last_30_days", _fmt_count),
+        ("🏆 Payouts", "total_payouts_hbd", _fmt_hbd),
+    )
+)
+_LABEL_UPDATED = Text("🕒 Updated")
+_LABEL_STALE = Text("⚠️ Stale")
+_LABEL_STATUS_FAILED = Text("❌ Status")
+_LABEL_FIX = Text("💡 Fix")
+_LABEL_DETAILS = Text("Details")
+_LABEL_LOADING = Text("⏳ Status")
+
+
+def _make_hive_table() -> Table:
+    """Build an empty stats table; rows are filled in per refresh"""
     table = Table(show_header=True, header_style="bold cyan", padding=(0, 1), box=None)
     table.add_column("Metric", style="cyan", width=15)
     table.add_column("Value", style="green", width=12)
+    return table
+
+
+def create_hive_stats_panel(monitor) -> Panel:
+    """Create Hive community stats panel"""
+    global _last_panel_key, _last_panel
+    
+    # Stats are fetched in the background by the dashboard; the panel only reads them
+    age_min = None
+    if monitor.hive_stats_fetched_at:
+        age_min = int((time.monotonic() - monitor.hive_stats_fetched_at)//60)
     
-    # Fetch fresh stats every 5 minutes or if no data
-    if (not monitor.last_hive_stats_fetch or 
-        (datetime.now() - monitor.last_hive_stats_fetch).total_seconds() > 300):
-        monitor.fetch_hive_stats()
+    # Reuse the last panel while nothing it shows has changed
+    panel_key = (monitor.hive_stats_version, age_min, monitor.hive_stats_error)
+    if _last_panel is not None and panel_key == _last_panel_key:
+        return _last_panel
+    
+    table = _make_hive_table()
     
     if monitor.hive_stats:
         stats = monitor.hive_stats
         
-        # Community Overview
-        subs = stats.get('total_subscribers', 'N/A')
-        posts = stats.get('total_posts', 'N/A')
-        comments = stats.get('total_comments', 'N/A')
-        
-        table.add_row("👥 Subscribers", f"{subs:,}" if isinstance(subs, int) else str(subs))
-        table.add_row("📝 Posts", f"{posts:,}" if isinstance(posts, int) else str(posts))
-        table.add_row("💬 Comments", f"{comments:,}" if isinstance(comments, int) else str(comments))
-        
-        # Recent Activity (30 days)
-        authors_30d = stats.get('unique_post_authors_last_30_days', 'N/A')
-        commenters_30d = stats.get('unique_comment_authors_last_30_days', 'N/A')
+        # Community overview, recent activity (30 days) and payouts
+        for label, key, fmt in _ROWS:
+            table.add_row(label, Text(fmt(stats.get(key))))
         
-        table.add_row("✍️ Authors (30d)", str(authors_30d))
-        table.add_row("💭 Users (30d)", str(commenters_30d))
-        
-        # Payouts
-        try:
-            total_payouts = float(stats.get('total_payouts_hbd', 0))
-            table.add_row("🏆 Payouts", f"{total_payouts:,.0f} HBD")
-        except (ValueError, TypeError):
-            table.add_row("🏆 Payouts", f"{stats.get('total_payouts_hbd', 'N/A')} HBD")
-            
         # Status
-        if monitor.last_hive_stats_fetch:
-            age = datetime.now() - monitor.last_hive_stats_fetch
-            age_min = int(age.total_seconds()//60)
-            table.add_row("🕒 Updated", f"{age_min}m ago")
+        if age_min is not None:
+            if monitor.hive_stats_error:
+                # Last refresh failed; these are the last good stats
+                table.add_row(_LABEL_STALE, f"[dim]{age_min}m ago[/dim]")
+            else:
+                table.add_row(_LABEL_UPDATED, f"{age_min}m ago")
             
     elif monitor.hive_stats_error:
-        table.add_row("❌ Status", "API Failed")
+        table.add_row(_LABEL_STATUS_FAILED, "API Failed")
         if "requests" in str(monitor.hive_stats_error).lower():
-            table.add_row("💡 Fix", "pip install requests")
+            table.add_row(_LABEL_FIX, "pip install requests")
         else:
             error_short = str(monitor.hive_stats_error)[:10] + "..." if len(str(monitor.hive_stats_error)) > 10 else str(monitor.hive_stats_error)
-            table.add_row("Details", error_short)
+            table.add_row(_LABEL_DETAILS, error_short)
     else:
-        table.add_row("⏳ Status", "Loading...")
+        table.add_row(_LABEL_LOADING, "Loading...")
     
-    return Panel(table, title="🐝 Hive Community", border_style="magenta")
+    _last_panel_key = panel_key
+    _last_panel = Panel(table, title="🐝 Hive Community", border_style="magenta")
+    return _last_panel
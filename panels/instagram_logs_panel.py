@@ -4,9 +4,6 @@ Instagram Download Logs Panel
 Displays recent Instagram download history and statistics
 """
 
-import json
-import requests
-from datetime import datetime
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
@@ -18,6 +15,24 @@ from pathlib import Path
 # Import configuration
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import INSTAGRAM_LOCAL_URL, INSTAGRAM_EXTERNAL_URL
+from utils.http import json_loads, session
+from utils.timestamps import parse_datetime
+
+# Marks an Instagram post URL; the text after it is shown shortened
+_POST_MARKER = 'instagram.com/p/'
+
+# (threshold, divisor, suffix) for _fmt_bytes, largest first
+_SIZE_UNITS = ((1 << 20, 1 << 20, 'MB'), (1 << 10, 1 << 10, 'KB'))
+
+
+def _fmt_bytes(n) -> str:
+    """Format a byte count as MB/KB/B; zero or missing shows N/A"""
+    if not n:
+        return "N/A"
+    for threshold, divisor, suffix in _SIZE_UNITS:
+        if n > threshold:
+            return f"{n/divisor:.1f}{suffix}"
+    return f"{n}B"
 
 
 def get_instagram_logs():
@@ -25,9 +40,9 @@ def get_instagram_logs():
     try:
         # Try external URL first, fall back to local
         url = INSTAGRAM_EXTERNAL_URL if INSTAGRAM_EXTERNAL_URL else INSTAGRAM_LOCAL_URL
-        response = requests.get(f"{url}/logs", timeout=5)
+        response = session.get(f"{url}/logs", timeout=5)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return {"logs": [], "error": f"HTTP {response.status_code}"}
     except Exception as e:
         return {"logs": [], "error": str(e)}
@@ -55,7 +70,7 @@ def create_instagram_logs_panel():
     
     for log in logs[:10]:  # Show last 10 downloads
         try:
-            timestamp = datetime.fromisoformat(log.get('timestamp', '').replace('Z', '+00:00'))
+            timestamp = parse_datetime(log.get('timestamp', ''))
             time_str = timestamp.strftime("%H:%M:%S")
         except:
             time_str = "Unknown"
@@ -75,8 +90,9 @@ def create_instagram_logs_panel():
         
         # URL shortening
         url = log.get('url', '')
-        if 'instagram.com/p/' in url:
-            url_short = url.split('/p/')[-1][:15] + "..."
+        _, marker, post_path = url.partition(_POST_MARKER)
+        if marker:
+            url_short = post_path[:15] + "..."
         else:
             url_short = url[:30] + "..." if len(url) > 30 else url
         
@@ -86,13 +102,7 @@ def create_instagram_logs_panel():
             filename = filename[:20] + "..."
         
         # Size formatting
-        bytes_size = log.get('bytes', 0)
-        if bytes_size > 1024*1024:
-            size_str = f"{bytes_size/(1024*1024):.1f}MB"
-        elif bytes_size > 1024:
-            size_str = f"{bytes_size/1024:.1f}KB"
-        else:
-            size_str = f"{bytes_size}B" if bytes_size else "N/A"
+        size_str = _fmt_bytes(log.get('bytes', 0))
         
         # Duration
         duration = log.get('duration', 0)
@@ -4,11 +4,15 @@ Instagram Download Monitor Panel
 Displays Instagram service health, cookie status, and recent downloads
 """
 
-import json
+import functools
+import re
 import requests
 import subprocess
-import asyncio
-from datetime import datetime
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import datetime, timezone
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
@@ -27,56 +31,138 @@ from config import (
     SKATEHIVE_NODES,
     NODE_NAME,
 )
+from utils.cache import ttl_cache
+from utils.http import CircuitBreaker, json_loads
+from utils.timestamps import log_time_key, parse_datetime
+
+try:
+    import docker
+    from docker.errors import DockerException, NotFound
+except ImportError:  # docker-py is optional; the docker CLI is used without it
+    docker = None
 
 # Build URLs from config
 PRIMARY_INSTAGRAM_URL = INSTAGRAM_EXTERNAL_URL if INSTAGRAM_EXTERNAL_URL else INSTAGRAM_LOCAL_URL
 RENDER_INSTAGRAM_URL = "https://skate-insta.onrender.com"
 
+# Instagram post ID from an instagram.com/p/<id>/ URL
+_POST_URL_RE = re.compile(r'instagram\.com/p/([^/?#]+)')
+
+# Last 3 parsed downloads and the docker timestamp of the newest ytipfs-worker line read
+_recent_downloads = deque(maxlen=3)
+_downloads_since = None
+_downloads_lock = threading.Lock()
+
+# Docker API client and ytipfs-worker container, kept across refreshes when docker-py is installed
+_docker_client = None
+_worker_container = None
+
+# Probe results the last Instagram panel was built from, and that panel
+_last_panel_inputs = None
+_last_panel = None
+
+# url -> (validator headers, parsed body) of the last 200 from its /health,
+# replayed as a conditional request so an unchanged body comes back as a bodyless 304
+_health_validators = {}
+
+# Fails Instagram requests fast for 60s once a host has failed 3 times in a row,
+# so a dead host costs one error per probe instead of a full timeout each refresh
+_breaker = CircuitBreaker(threshold=3, cooldown=60.0)
+
+# Upper bound on waiting for any single probe while building the panel (seconds)
+PROBE_TIMEOUT = 12
+
+# One worker per probe in create_instagram_panel (two health checks, cookies, downloads)
+_probe_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="instagram-probe")
+
+
+def refresh_probes():
+    """Warm the probe caches in parallel so create_instagram_panel reads cached results"""
+    futures = [
+        _probe_executor.submit(check_service_health, RENDER_INSTAGRAM_URL),
+        _probe_executor.submit(check_cookie_expiry),
+        _probe_executor.submit(get_instagram_logs),
+    ]
+    if PRIMARY_INSTAGRAM_URL:
+        futures.append(_probe_executor.submit(check_service_health, PRIMARY_INSTAGRAM_URL))
+    wait(futures)
+
+
+def _stale_note(result) -> str:
+    """Dim suffix marking a probe result served from the last good response"""
+    if result.get('stale'):
+        return f" [dim]⚠ stale {int(result['stale_age'])}s[/dim]"
+    return ""
+
 
+@ttl_cache(10, stale=300, is_ok=lambda r: 'error' not in r)
 def get_instagram_logs():
     """Fetch Instagram download logs from the service"""
     try:
         url = f"{PRIMARY_INSTAGRAM_URL}/logs" if PRIMARY_INSTAGRAM_URL else f"{INSTAGRAM_LOCAL_URL}/logs"
-        response = requests.get(url, timeout=10)
+        response = _breaker.get(url, timeout=10)
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         return {"logs": [], "error": f"HTTP {response.status_code}"}
     except Exception as e:
         return {"logs": [], "error": str(e)}
 
 
-def create_instagram_panel(monitor):
-    """Create Instagram monitoring panel"""
-    
-    # Create main table
+def _make_instagram_table() -> Table:
+    """Build an empty service table; rows are filled in per refresh"""
     table = Table(box=box.ROUNDED, expand=True)
     table.add_column("Metric", style="cyan", width=20)
     table.add_column("Status", style="green", width=15)
     table.add_column("Details", style="white")
+    return table
+
+
+def create_instagram_panel(monitor):
+    """Create Instagram monitoring panel"""
+    global _last_panel_inputs, _last_panel
+    
+    # Create main table
+    table = _make_instagram_table()
+    inputs = None
     
     try:
+        # Start every probe at once so the panel waits for the slowest one, not their sum
+        primary_future = _probe_executor.submit(check_service_health, PRIMARY_INSTAGRAM_URL) if PRIMARY_INSTAGRAM_URL else None
+        render_future = _probe_executor.submit(check_service_health, RENDER_INSTAGRAM_URL)
+        cookie_future = _probe_executor.submit(check_cookie_expiry)
+        downloads_future = _probe_executor.submit(get_recent_downloads)
+        
         # Check Instagram service health
-        tailscale_health = check_service_health(PRIMARY_INSTAGRAM_URL) if PRIMARY_INSTAGRAM_URL else {'status': False}
-        render_health = check_service_health(RENDER_INSTAGRAM_URL)
+        tailscale_health = primary_future.result(timeout=PROBE_TIMEOUT) if primary_future else {'status': False}
+        render_health = render_future.result(timeout=PROBE_TIMEOUT)
+        cookie_health = cookie_future.result(timeout=PROBE_TIMEOUT)
+        recent_downloads = downloads_future.result(timeout=PROBE_TIMEOUT)
+        
+        # Cached probe results come back as the same objects, so this is
+        # usually an identity check; reuse the last panel when nothing changed
+        inputs = (tailscale_health, render_health, cookie_health, recent_downloads)
+        if _last_panel is not None and inputs == _last_panel_inputs:
+            return _last_panel
         
-        # Service Status - show current node
+        # Service Status - show current node. The Primary and Tailscale rows
+        # describe the same endpoint, so both render the one primary probe
         hostname_display = TAILSCALE_HOSTNAME if TAILSCALE_HOSTNAME else "localhost"
         table.add_row(
             "🌐 Primary Service",
             "🟢 UP" if tailscale_health['status'] else "🔴 DOWN",
-            f"{hostname_display} - {tailscale_health.get('version', tailscale_health.get('data', {}).get('version', 'Unknown'))}"
+            f"{hostname_display} - {tailscale_health.get('version', tailscale_health.get('data', {}).get('version', 'Unknown'))}{_stale_note(tailscale_health)}"
         )
         
         table.add_row(
             "🌐 Tailscale Service", 
             "🟢 UP" if tailscale_health['status'] else "🔴 DOWN",
-            f"Primary endpoint via Tailscale Funnel"
+            f"Primary endpoint via Tailscale Funnel{_stale_note(tailscale_health)}"
         )
         
         table.add_row(
             "☁️  Render Service",
             "🟢 UP" if render_health['status'] else "🔴 DOWN", 
-            f"skate-insta.onrender.com"
+            f"skate-insta.onrender.com{_stale_note(render_health)}"
         )
         
         table.add_row("", "", "")  # Separator
@@ -97,12 +183,11 @@ def create_instagram_panel(monitor):
             )
             
             # Cookie expiry check
-            cookie_health = check_cookie_expiry()
             if cookie_health:
                 table.add_row(
                     "⏰ Cookie Expiry",
                     cookie_health['status'],
-                    cookie_health['details']
+                    cookie_health['details'] + _stale_note(cookie_health)
                 )
         else:
             table.add_row(
@@ -114,7 +199,6 @@ def create_instagram_panel(monitor):
         table.add_row("", "", "")  # Separator
         
         # Recent Downloads
-        recent_downloads = get_recent_downloads()
         if recent_downloads:
             table.add_row(
                 "📥 Latest Download",
@@ -138,39 +222,58 @@ def create_instagram_panel(monitor):
                 "No recent downloads found"
             )
             
+    except FuturesTimeoutError:
+        table.add_row("❌ Error", "🔴 TIMEOUT", f"Probes did not finish within {PROBE_TIMEOUT}s")
+        inputs = None
     except Exception as e:
         table.add_row("❌ Error", "🔴 FAILED", f"Monitor error: {str(e)}")
+        inputs = None
     
-    return Panel(
+    panel = Panel(
         table,
         title="📱 Instagram Download Service",
         border_style="blue",
         expand=True
     )
+    _last_panel_inputs, _last_panel = inputs, panel
+    return panel
 
 
+@ttl_cache(15, stale=300, is_ok=lambda r: r['status'])
 def check_service_health(url):
     """Check health of an Instagram service"""
+    validators, cached_data = _health_validators.get(url, (None, None))
     try:
-        response = requests.get(f"{url}/health", timeout=5)
+        response = _breaker.get(f"{url}/health", headers=validators, timeout=5)
+        if response.status_code == 304 and cached_data is not None:
+            return {'status': True, 'data': cached_data}
         if response.status_code == 200:
+            data = json_loads(response.content)
+            # Prefer the ETag; fall back to Last-Modified when that is all the service sends
+            if 'ETag' in response.headers:
+                _health_validators[url] = ({'If-None-Match': response.headers['ETag']}, data)
+            elif 'Last-Modified' in response.headers:
+                _health_validators[url] = ({'If-Modified-Since': response.headers['Last-Modified']}, data)
+            else:
+                _health_validators.pop(url, None)
             return {
                 'status': True,
-                'data': response.json()
+                'data': data
             }
         else:
             return {'status': False, 'error': f"HTTP {response.status_code}"}
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         return {'status': False, 'error': str(e)}
 
 
+@ttl_cache(15, stale=300, is_ok=lambda r: r['status'] != '🔴 ERROR')
 def check_cookie_expiry():
     """Check Instagram cookie expiry status"""
     try:
         url = f"{PRIMARY_INSTAGRAM_URL}/cookies/status" if PRIMARY_INSTAGRAM_URL else f"{INSTAGRAM_LOCAL_URL}/cookies/status"
-        response = requests.get(url, timeout=10)
+        response = _breaker.get(url, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             
             # Simple cookie health logic
             if data.get('cookies_valid'):
@@ -200,72 +303,134 @@ def check_cookie_expiry():
         }
 
 
+def _parse_download(line):
+    """Turn a 'Final file for IPFS upload' log line into a download record, or None"""
+    if 'Final file for IPFS upload:' not in line or '.mp4' not in line:
+        return None
+    
+    # Extract filename from log line
+    filename = line.split('Final file for IPFS upload: /data/')[-1].strip()
+    
+    # Get timestamp from log line
+    timestamp_part = line.split(' INFO ')[0]
+    
+    # Mock data for demo - in real implementation, you'd parse more log data
+    return {
+        'filename': filename,
+        'timestamp': timestamp_part,
+        'size': 'Unknown',  # Would need to parse from other logs
+        'gateway': 'https://ipfs.skatehive.app/ipfs/...'  # Would need CID from logs
+    }
+
+
+def _stamp_epoch(stamp):
+    """Epoch seconds of a docker RFC3339Nano log timestamp"""
+    head, _, frac = stamp.rstrip('Z').partition('.')
+    whole = datetime.strptime(head, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+    return whole.timestamp() + float(f"0.{frac or 0}")
+
+
+def _read_worker_logs(since):
+    """Return timestamped ytipfs-worker stdout lines (the last 50, or those since the since stamp)
+
+    Uses the Docker API socket when docker-py is installed, so no docker CLI
+    process is spawned per refresh; falls back to the CLI otherwise. Returns
+    None if the logs could not be read.
+    """
+    global _docker_client, _worker_container
+    
+    if docker is not None:
+        try:
+            if _worker_container is None:
+                if _docker_client is None:
+                    _docker_client = docker.from_env(timeout=5)
+                _worker_container = _docker_client.containers.get('ytipfs-worker')
+            log_args = {'tail': 50} if since is None else {'since': _stamp_epoch(since)}
+            output = _worker_container.logs(stdout=True, stderr=False, timestamps=True, **log_args)
+            return output.decode(errors='replace').splitlines()
+        except NotFound:
+            # Container was removed or recreated; look it up again next refresh
+            _worker_container = None
+            return None
+        except DockerException:
+            pass
+    
+    log_args = ['--tail', '50'] if since is None else ['--since', since]
+    result = subprocess.run(
+        ['docker', 'logs', '--timestamps', *log_args, 'ytipfs-worker'],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    return result.stdout.splitlines() if result.returncode == 0 else None
+
+
+@ttl_cache(10)
 def get_recent_downloads():
-    """Get recent Instagram downloads from Docker logs"""
-    try:
-        # Get recent logs from ytipfs-worker container
-        result = subprocess.run(
-            ['docker', 'logs', '--tail', '50', 'ytipfs-worker'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        downloads = []
-        lines = result.stdout.split('\n')
-        
-        for line in lines:
-            if 'Final file for IPFS upload:' in line and '.mp4' in line:
-                try:
-                    # Extract filename from log line
-                    filename = line.split('Final file for IPFS upload: /data/')[-1].strip()
-                    
-                    # Get timestamp from log line
-                    timestamp_part = line.split(' INFO ')[0]
-                    
-                    # Mock data for demo - in real implementation, you'd parse more log data
-                    downloads.append({
-                        'filename': filename,
-                        'timestamp': timestamp_part,
-                        'size': 'Unknown',  # Would need to parse from other logs
-                        'gateway': 'https://ipfs.skatehive.app/ipfs/...'  # Would need CID from logs
-                    })
-                except Exception:
-                    continue
-                    
-        return downloads[:3]  # Return last 3 downloads
+    """Get recent Instagram downloads from Docker logs
+
+    The first call scans the last 50 log lines; later calls only ask Docker for
+    lines after the newest one already read, so each refresh parses new lines only.
+    """
+    global _downloads_since
+    
+    with _downloads_lock:
+        try:
+            # Get recent logs from ytipfs-worker container
+            lines = _read_worker_logs(_downloads_since)
+            if lines is not None:
+                # Each line is prefixed with its timestamp. --since is inclusive, so
+                # lines at or before the cursor were returned by the previous read
+                since_key = log_time_key(_downloads_since) if _downloads_since else ""
+                for line in lines:
+                    stamp, _, log = line.partition(' ')
+                    key = log_time_key(stamp)
+                    if key <= since_key:
+                        continue
+                    _downloads_since, since_key = stamp, key
+                    # Parse on append; the deque keeps only the last 3 downloads
+                    download = _parse_download(log)
+                    if download:
+                        _recent_downloads.append(download)
+        except Exception:
+            pass
         
-    except Exception:
-        return []
+        # Newest first, so [0] is the latest download
+        return list(reversed(_recent_downloads))
 
 
+@functools.lru_cache(maxsize=512)
 def format_timestamp(timestamp_str):
-    """Format timestamp for display"""
+    """Format timestamp for display; memoized since the same timestamps recur every refresh"""
     if not timestamp_str or timestamp_str == 'Never':
         return 'Never'
     
     try:
         # Parse ISO timestamp
-        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        dt = parse_datetime(timestamp_str)
         return dt.strftime('%Y-%m-%d %H:%M:%S')
     except Exception:
         return str(timestamp_str)[:19]  # Truncate if parsing fails
 
 
+@functools.lru_cache(maxsize=512)
+def _fmt_hms(timestamp_str):
+    """Format an ISO timestamp as HH:MM:SS; memoized like format_timestamp"""
+    return parse_datetime(timestamp_str).strftime('%H:%M:%S')
+
+
 def create_instagram_logs_panel(monitor):
     """Create Instagram download logs panel (similar to video transcoder)"""
     try:
-        # Get Instagram logs
-        url = f"{PRIMARY_INSTAGRAM_URL}/logs" if PRIMARY_INSTAGRAM_URL else f"{INSTAGRAM_LOCAL_URL}/logs"
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
+        # Get Instagram logs (shared TTL cache with stale fallback)
+        logs_data = get_instagram_logs()
+        if "error" in logs_data:
             return Panel(
                 Align.center("❌ Could not fetch Instagram logs"),
                 title="📱 Instagram Download Logs",
                 border_style="red"
             )
         
-        logs_data = response.json()
         logs = logs_data.get("logs", [])
         
         # Filter out processing entries, only show completed/failed
@@ -292,15 +457,14 @@ def create_instagram_logs_panel(monitor):
                 
                 # Format timestamp
                 if timestamp:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    time_str = dt.strftime('%H:%M:%S')
+                    time_str = _fmt_hms(timestamp)
                 else:
                     time_str = "Unknown"
                 
                 # Format URL (extract Instagram post ID)
-                if 'instagram.com/p/' in url:
-                    post_id = url.split('/p/')[-1].split('/')[0]
-                    url_display = f"instagram.com/p/{post_id}"
+                match = _POST_URL_RE.search(url)
+                if match:
+                    url_display = f"instagram.com/p/{match.group(1)}"
                 else:
                     url_display = url[:40] + "..." if len(url) > 40 else url
                 
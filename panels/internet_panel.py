@@ -4,25 +4,54 @@ Internet Status Panel
 Displays internet connectivity and speed test information
 """
 
-from datetime import datetime
+import time
 from rich.panel import Panel
 from rich.table import Table
 
 
-def create_internet_panel(monitor) -> Panel:
-    """Create internet status panel"""
+# Last rendered panel and the values it was built from
+_last_panel_key = None
+_last_panel = None
+
+
+def _make_internet_table() -> Table:
+    """Build an empty status table; rows are filled in per refresh"""
     table = Table(show_header=True, header_style="bold cyan", padding=(0, 1), box=None)
     table.add_column("Metric", style="cyan", width=10)
     table.add_column("Value", style="green", width=15)
+    return table
+
+
+def create_internet_panel(monitor) -> Panel:
+    """Create internet status panel"""
+    global _last_panel_key, _last_panel
+    
+    # Basic connectivity, probed in the background by the dashboard
+    conn_status = monitor.internet_status
+    
+    age_min = None
+    if monitor.speed_test_finished_at:
+        age_min = int((time.monotonic() - monitor.speed_test_finished_at)//60)
+    
+    # Reuse the last panel while nothing it shows has changed
+    panel_key = (
+        conn_status["status"],
+        conn_status["latency"],
+        monitor.speedtest_status,
+        tuple(monitor.internet_speed.values()),
+        age_min,
+        monitor.speedtest_error,
+    )
+    if _last_panel is not None and panel_key == _last_panel_key:
+        return _last_panel
     
-    # Basic connectivity
-    conn_status = monitor.check_internet_connection()
+    table = _make_internet_table()
     table.add_row("Connection", conn_status["status"])
     table.add_row("Latency", conn_status["latency"])
     
     # Speed test status and results
     status = monitor.speedtest_status
-    if status == "Complete" and monitor.last_speed_test:
+    if status == "Complete" and age_min is not None:
         # Show all metrics
         download = monitor.internet_speed.get('download', 0)
         upload = monitor.internet_speed.get('upload', 0)
@@ -32,8 +61,6 @@ def create_internet_panel(monitor) -> Panel:
         table.add_row("Upload", f"{upload:.1f} Mbps") 
         table.add_row("Ping", f"{ping:.1f} ms")
         
-        age = datetime.now() - monitor.last_speed_test
-        age_min = int(age.total_seconds()//60)
         table.add_row("Last Test", f"{age_min}m ago")
         
     elif status == "Running test...":
@@ -46,4 +73,6 @@ def create_internet_panel(monitor) -> Panel:
     else:
         table.add_row("Speed Test", "🔄 Pending...")
     
-    return Panel(table, title="🌐 Internet Status", border_style="blue")
+    _last_panel_key = panel_key
+    _last_panel = Panel(table, title="🌐 Internet Status", border_style="blue")
+    return _last_panel
@@ -4,175 +4,257 @@ Logs Panel
 Displays compact summary of container logs for download tracking and error detection
 """
 
+import functools
 import re
+from collections import deque
 from rich.panel import Panel
 from rich.text import Text
 
+try:
+    import re2
+except ImportError:  # google-re2 is an optional speedup; stdlib re is used without it
+    re2 = None
+
+
+# Only the head of a line is matched against the patterns below, so a multi-KB
+# stack trace or dump line costs the same as a normal one. Event markers and the
+# fields the panel shows all sit well within it.
+MAX_SCAN_CHARS = 512
+
+# Linear-time RE2 when installed, stdlib re otherwise. Flags are written inline
+# as (?i) so every pattern below compiles the same under both engines
+_compile = re2.compile if re2 else re.compile
+
+# Patterns used while parsing each log line, compiled once at import
+# video-worker enhanced log fields
+_REQUEST_ID_RE = _compile(r'ID: ([a-f0-9]{8})')
+_CLIENT_RE = _compile(r'Client: ([^\s]+)')
+_CREATOR_RE = _compile(r'Creator: ([^\s]+)')
+_DURATION_RE = _compile(r'Duration: (\d+)ms')
+_ERROR_DETAIL_RE = _compile(r'Error: ([^|]+)')
+_FFMPEG_TIME_RE = _compile(r'Time: ([\d:\.]+)')
+_RESPONSE_SIZE_RE = _compile(r'" 200 (\d+) "')
+# ytipfs-worker download log fields
+_DOWNLOAD_URL_RE = _compile(r'INFO Downloading:\s+(https?://[^\s]+)')
+_FINAL_FILE_RE = _compile(r'Final file for IPFS upload:\s+(.+)')
+_IG_ERROR_RE = _compile(r'ERROR: \[Instagram\] ([^:]+): (.+)')
+# Event markers in branch priority order, and one alternation per service so a
+# single scan finds every marker in a line
+_VIDEO_MARKERS = (
+    "TRANSCODE-START", "TRANSCODE-SUCCESS", "TRANSCODE-FAILED",
+    "FFMPEG-PROGRESS", "IPFS-UPLOAD-START", "POST /transcode",
+)
+_VIDEO_MARKER_RE = _compile(
+    r'TRANSCODE-START|TRANSCODE-SUCCESS|TRANSCODE-FAILED|FFMPEG-PROGRESS|IPFS-UPLOAD-START|POST /transcode'
+)
+_YTIPFS_MARKERS = (
+    "INFO Downloading:", "Final file for IPFS upload:", "There is no video in this post",
+    "ERROR: [Instagram]", "POST /download",
+)
+_YTIPFS_MARKER_RE = _compile(
+    r'INFO Downloading:|Final file for IPFS upload:|There is no video in this post|ERROR: \[Instagram\]|POST /download'
+)
+# Keyword tests, one alternation scan per line instead of one substring walk per keyword
+_ACTIVITY_RE = _compile(r'(?i)downloading|converted|final file|post /download')
+_HEALTH_RE = _compile(r'(?i)health')
+# Generic error summary; case-insensitive so the line need not be lowercased first
+_GENERAL_ERROR_RE = _compile(r'(?i)(error|failed|exception)[:\s]+(.{0,35})')
+
+
+def _find_marker(marker_re, markers, log: str):
+    """Return the event marker in log that ranks first in markers, or None"""
+    # Rank by priority, not position: yt-dlp logs "ERROR: [Instagram] <id>: There is
+    # no video in this post", where the no-video branch must win
+    found = marker_re.findall(log)
+    if len(found) > 1:
+        return min(found, key=markers.index)
+    return found[0] if found else None
+
+
+def _is_video_worker_activity(log: str) -> bool:
+    """video-worker activity: POST /transcode requests that are not health checks"""
+    return "POST /transcode" in log and not _HEALTH_RE.search(log)
+
+
+def _is_ytipfs_activity(log: str) -> bool:
+    """ytipfs-worker activity: download operations that are not health checks"""
+    return bool(_ACTIVITY_RE.search(log)) and not _HEALTH_RE.search(log)
+
+
+def _parse_video_worker_line(log: str, downloads: deque):
+    """Append the event a video-worker log line describes to downloads; return its error, if any"""
+    line_error = None
+    marker = _find_marker(_VIDEO_MARKER_RE, _VIDEO_MARKERS, log)
+    
+    # Parse video-worker enhanced logs, dispatched on the event marker found in the line
+    if marker == "TRANSCODE-START":
+        # Extract request info from enhanced logs
+        request_id_match = _REQUEST_ID_RE.search(log)
+        client_match = _CLIENT_RE.search(log)
+        creator_match = _CREATOR_RE.search(log)
+        
+        request_id = request_id_match.group(1) if request_id_match else "unknown"
+        client = client_match.group(1) if client_match else "unknown"
+        creator = creator_match.group(1) if creator_match else "anonymous"
+        
+        downloads.append((f"🚀 Starting: {request_id} | {creator} | {client[:15]}", "starting"))
+        
+    elif marker == "TRANSCODE-SUCCESS":
+        # Extract completion info
+        request_id_match = _REQUEST_ID_RE.search(log)
+        duration_match = _DURATION_RE.search(log)
+        
+        request_id = request_id_match.group(1) if request_id_match else "unknown"
+        duration = duration_match.group(1) if duration_match else "unknown"
+        
+        downloads.append((f"✅ Completed: {request_id} ({duration}ms)", "completed"))
+        
+    elif marker == "TRANSCODE-FAILED":
+        # Extract failure info
+        request_id_match = _REQUEST_ID_RE.search(log)
+        error_match = _ERROR_DETAIL_RE.search(log)
+        
+        request_id = request_id_match.group(1) if request_id_match else "unknown"
+        error = error_match.group(1).strip() if error_match else "unknown error"
+        
+        downloads.append((f"❌ Failed: {request_id} - {error[:30]}", "error"))
+        line_error = f"Request {request_id}: {error[:50]}"
+            
+    elif marker == "FFMPEG-PROGRESS":
+        # Extract progress info
+        request_id_match = _REQUEST_ID_RE.search(log)
+        time_match = _FFMPEG_TIME_RE.search(log)
+        
+        if request_id_match and time_match:
+            request_id = request_id_match.group(1)
+            time_progress = time_match.group(1)
+            downloads.append((f"⏳ Processing: {request_id} @ {time_progress}", "processing"))
+            
+    elif marker == "IPFS-UPLOAD-START":
+        # Extract IPFS upload start
+        request_id_match = _REQUEST_ID_RE.search(log)
+        if request_id_match:
+            request_id = request_id_match.group(1)
+            downloads.append((f"☁️ Uploading: {request_id}", "uploading"))
+            
+    elif marker == "POST /transcode":
+        # Parse Apache-style log: IP - - [timestamp] "POST /transcode HTTP/1.1" status size
+        if '" 200 ' in log:
+            # Extract response size to show activity
+            size_match = _RESPONSE_SIZE_RE.search(log)
+            response_size = size_match.group(1) if size_match else "unknown"
+            downloads.append((f"✅ HTTP Success ({response_size}B)", "completed"))
+        elif '" 500 ' in log or '" 400 ' in log:
+            downloads.append((f"❌ HTTP Error", "error"))
+            line_error = "HTTP error in transcode request"
+        elif '" 4' in log:  # 4xx errors
+            downloads.append((f"❌ Client error", "error"))
+            line_error = "Client error in transcode request"
+    
+    return line_error
+
+
+def _parse_ytipfs_line(log: str, downloads: deque):
+    """Append the event a ytipfs-worker log line describes to downloads; return its error, if any"""
+    line_error = None
+    marker = _find_marker(_YTIPFS_MARKER_RE, _YTIPFS_MARKERS, log)
+    
+    # Dispatched on the event marker found in the line
+    # Look for Instagram/video download start
+    if marker == "INFO Downloading:":
+        url_match = _DOWNLOAD_URL_RE.search(log)
+        if url_match:
+            url = url_match.group(1)
+            # Extract platform and video ID for cleaner display
+            if "instagram.com" in url:
+                if "/reel/" in url:
+                    video_id = url.rpartition('/reel/')[2].partition('?')[0][:12]
+                    downloads.append((f"📱 IG Reel: {video_id}", "downloading"))
+                elif "/p/" in url:
+                    video_id = url.rpartition('/p/')[2].partition('?')[0][:12]
+                    downloads.append((f"📱 IG Post: {video_id}", "downloading"))
+                else:
+                    downloads.append((f"📱 Instagram content", "downloading"))
+            elif "youtube.com" in url or "youtu.be" in url:
+                downloads.append((f"📺 YouTube video", "downloading"))
+            else:
+                platform = url.partition('//')[2].partition('/')[0].replace('www.', '')
+                downloads.append((f"🎥 {platform} video", "downloading"))
+    
+    # Look for completed conversions/uploads
+    elif marker == "Final file for IPFS upload:":
+        file_match = _FINAL_FILE_RE.search(log)
+        if file_match:
+            filename = file_match.group(1).rpartition('/')[2]  # Get just the filename
+            # Clean up the filename for display
+            if len(filename) > 25:
+                filename = filename[:22] + "..."
+            downloads.append((f"✅ Ready: {filename}", "completed"))
+    
+    # Look for specific Instagram errors
+    elif marker == "There is no video in this post":
+        downloads.append((f"❌ No video in IG post", "error"))
+        line_error = "Instagram post contains no video"
+    
+    # Look for other specific errors
+    elif marker == "ERROR: [Instagram]":
+        error_match = _IG_ERROR_RE.search(log)
+        if error_match:
+            video_id = error_match.group(1)[:10]
+            error_msg = error_match.group(2)[:30]
+            line_error = f"IG {video_id}: {error_msg}"
+            downloads.append((f"❌ Failed: {video_id}", "error"))
+    
+    # Look for HTTP POST requests
+    elif marker == "POST /download":
+        if "500 Internal Server Error" in log:
+            downloads.append((f"❌ Download failed", "error"))
+        elif "200 OK" in log:
+            downloads.append((f"📥 Download request", "success"))
+    
+    return line_error
+
+
+@functools.lru_cache(maxsize=32)
+def _container_kind(container: str):
+    """Return (is_video_worker, activity test, line parser) for a container name"""
+    if "video-worker" in container:
+        return True, _is_video_worker_activity, _parse_video_worker_line
+    return False, _is_ytipfs_activity, _parse_ytipfs_line
+
 
 def create_logs_panel(monitor, container: str, title: str) -> Panel:
     """Create compact logs panel for a service"""
     logs = monitor.get_recent_logs(container, 25)  # Get more lines to capture full download sequences
 
-    # Parse logs for essential info
-    downloads = []
+    # Parse logs for essential info; only the 4 most recent download entries are kept
+    downloads = deque(maxlen=4)
     last_error = None
     activity_count = 0
 
-    # Determine service type from container name
-    is_video_worker = "video-worker" in container
+    # Determine service type from container name, and pick its activity test
+    # and line parser once rather than branching on it for every line
+    is_video_worker, is_activity, parse_line = _container_kind(container)
     
-    for log in reversed(logs):
-        # Count any activity based on service type
-        if is_video_worker:
-            # For video-worker: look for POST /transcode operations
-            if "POST /transcode" in log and "health" not in log.lower():
-                activity_count += 1
-        else:
-            # For ytipfs-worker: look for download operations
-            if any(keyword in log.lower() for keyword in ["downloading", "converted", "final file", "post /download"]) and "health" not in log.lower():
-                activity_count += 1
-            
-    for log in reversed(logs):
-        # Count any activity based on service type
-        if is_video_worker:
-            # For video-worker: look for POST /transcode operations
-            if "POST /transcode" in log and "health" not in log.lower():
-                activity_count += 1
-        else:
-            # For ytipfs-worker: look for download operations
-            if any(keyword in log.lower() for keyword in ["downloading", "converted", "final file", "post /download"]) and "health" not in log.lower():
-                activity_count += 1
-            
+    # One pass, oldest first: the deque ends up holding the newest entries and
+    # each error found overwrites last_error, so both reflect the latest lines
+    for log in logs:
+        scan = log if len(log) <= MAX_SCAN_CHARS else log[:MAX_SCAN_CHARS]
+        if is_activity(scan):
+            activity_count += 1
+        
         # Service-specific log parsing
-        if is_video_worker:
-            # Parse video-worker enhanced logs
-            if "TRANSCODE-START" in log:
-                # Extract request info from enhanced logs
-                request_id_match = re.search(r'ID: ([a-f0-9]{8})', log)
-                client_match = re.search(r'Client: ([^\s]+)', log)
-                creator_match = re.search(r'Creator: ([^\s]+)', log)
-                
-                request_id = request_id_match.group(1) if request_id_match else "unknown"
-                client = client_match.group(1) if client_match else "unknown"
-                creator = creator_match.group(1) if creator_match else "anonymous"
-                
-                downloads.append((f"🚀 Starting: {request_id} | {creator} | {client[:15]}", "starting"))
-                
-            elif "TRANSCODE-SUCCESS" in log:
-                # Extract completion info
-                request_id_match = re.search(r'ID: ([a-f0-9]{8})', log)
-                duration_match = re.search(r'Duration: (\d+)ms', log)
-                
-                request_id = request_id_match.group(1) if request_id_match else "unknown"
-                duration = duration_match.group(1) if duration_match else "unknown"
-                
-                downloads.append((f"✅ Completed: {request_id} ({duration}ms)", "completed"))
-                
-            elif "TRANSCODE-FAILED" in log:
-                # Extract failure info
-                request_id_match = re.search(r'ID: ([a-f0-9]{8})', log)
-                error_match = re.search(r'Error: ([^|]+)', log)
-                
-                request_id = request_id_match.group(1) if request_id_match else "unknown"
-                error = error_match.group(1).strip() if error_match else "unknown error"
-                
-                downloads.append((f"❌ Failed: {request_id} - {error[:30]}", "error"))
-                if not last_error:
-                    last_error = f"Request {request_id}: {error[:50]}"
-                    
-            elif "FFMPEG-PROGRESS" in log:
-                # Extract progress info
-                request_id_match = re.search(r'ID: ([a-f0-9]{8})', log)
-                time_match = re.search(r'Time: ([\d:\.]+)', log)
-                
-                if request_id_match and time_match:
-                    request_id = request_id_match.group(1)
-                    time_progress = time_match.group(1)
-                    downloads.append((f"⏳ Processing: {request_id} @ {time_progress}", "processing"))
-                    
-            elif "IPFS-UPLOAD-START" in log:
-                # Extract IPFS upload start
-                request_id_match = re.search(r'ID: ([a-f0-9]{8})', log)
-                if request_id_match:
-                    request_id = request_id_match.group(1)
-                    downloads.append((f"☁️ Uploading: {request_id}", "uploading"))
-                    
-            elif "POST /transcode" in log:
-                # Parse Apache-style log: IP - - [timestamp] "POST /transcode HTTP/1.1" status size
-                if '" 200 ' in log:
-                    # Extract response size to show activity
-                    size_match = re.search(r'" 200 (\d+) "', log)
-                    response_size = size_match.group(1) if size_match else "unknown"
-                    downloads.append((f"✅ HTTP Success ({response_size}B)", "completed"))
-                elif '" 500 ' in log or '" 400 ' in log:
-                    downloads.append((f"❌ HTTP Error", "error"))
-                    if not last_error:
-                        last_error = "HTTP error in transcode request"
-                elif '" 4' in log:  # 4xx errors
-                    downloads.append((f"❌ Client error", "error"))
-                    if not last_error:
-                        last_error = "Client error in transcode request"
-        else:
-            # Parse ytipfs-worker download logs (original logic)
-            # Look for Instagram/video download start
-            if "INFO Downloading:" in log:
-                url_match = re.search(r'INFO Downloading:\s+(https?://[^\s]+)', log)
-                if url_match:
-                    url = url_match.group(1)
-                    # Extract platform and video ID for cleaner display
-                    if "instagram.com" in url:
-                        if "/reel/" in url:
-                            video_id = url.split('/reel/')[-1].split('?')[0][:12]
-                            downloads.append((f"📱 IG Reel: {video_id}", "downloading"))
-                        elif "/p/" in url:
-                            video_id = url.split('/p/')[-1].split('?')[0][:12]
-                            downloads.append((f"📱 IG Post: {video_id}", "downloading"))
-                        else:
-                            downloads.append((f"📱 Instagram content", "downloading"))
-                    elif "youtube.com" in url or "youtu.be" in url:
-                        downloads.append((f"📺 YouTube video", "downloading"))
-                    else:
-                        platform = url.split('//')[1].split('/')[0].replace('www.', '')
-                        downloads.append((f"🎥 {platform} video", "downloading"))
-            
-            # Look for completed conversions/uploads
-            elif "Final file for IPFS upload:" in log:
-                file_match = re.search(r'Final file for IPFS upload:\s+(.+)', log)
-                if file_match:
-                    filename = file_match.group(1).split('/')[-1]  # Get just the filename
-                    # Clean up the filename for display
-                    if len(filename) > 25:
-                        filename = filename[:22] + "..."
-                    downloads.append((f"✅ Ready: {filename}", "completed"))
-            
-            # Look for specific Instagram errors
-            elif "There is no video in this post" in log:
-                downloads.append((f"❌ No video in IG post", "error"))
-                if not last_error:
-                    last_error = "Instagram post contains no video"
-            
-            # Look for other specific errors
-            elif "ERROR:" in log and "[Instagram]" in log:
-                error_match = re.search(r'ERROR: \[Instagram\] ([^:]+): (.+)', log)
-                if error_match and not last_error:
-                    video_id = error_match.group(1)[:10]
-                    error_msg = error_match.group(2)[:30]
-                    last_error = f"IG {video_id}: {error_msg}"
-                    downloads.append((f"❌ Failed: {video_id}", "error"))
-            
-            # Look for HTTP POST requests
-            elif "POST /download" in log:
-                if "500 Internal Server Error" in log:
-                    downloads.append((f"❌ Download failed", "error"))
-                elif "200 OK" in log:
-                    downloads.append((f"📥 Download request", "success"))
+        line_error = parse_line(scan, downloads)
         
-        # Look for general errors (but avoid long stack traces) - applies to both services
-        if any(error_word in log.lower() for error_word in ["error", "failed", "exception"]) and "Traceback" not in log:
-            if not last_error and len(log) < 100:  # Avoid long error messages
-                error_match = re.search(r'(error|failed|exception)[:\s]+(.{0,35})', log.lower())
-                if error_match:
-                    last_error = error_match.group(2)[:30] + "..."
+        # Look for general errors (but avoid long stack traces) - applies to both services.
+        # Cheap checks first; the regex only runs on short lines without a specific error
+        if not line_error and len(log) < 100 and "Traceback" not in log:  # Avoid long error messages
+            error_match = _GENERAL_ERROR_RE.search(log)
+            if error_match:
+                line_error = error_match.group(2)[:30].lower() + "..."
+        
+        if line_error:
+            last_error = line_error
 
     # Create summary content
     content_lines = []
@@ -187,10 +269,7 @@ def create_logs_panel(monitor, container: str, title: str) -> Panel:
             content_lines.append("✅ No errors in recent logs.")
         
     content_lines.append("")
-    if is_video_worker:
-        content_lines.append("Recent Activity:")
-    else:
-        content_lines.append("Recent Activity:")
+    content_lines.append("Recent Activity:")
     
     if activity_count > 0:
         if is_video_worker:
@@ -208,7 +287,7 @@ def create_logs_panel(monitor, container: str, title: str) -> Panel:
         else:
             content_lines.append("Recent Downloads:")
         # Show most recent downloads first
-        for download, status in downloads[-4:]:
+        for download, status in reversed(downloads):
             content_lines.append(f"• {download}")
     else:
         content_lines.append("")
@@ -222,15 +301,16 @@ def create_logs_panel(monitor, container: str, title: str) -> Panel:
         content_lines.append("")
         content_lines.append(f"⚠️ Last Error: {last_error}")
 
-    content = "\n".join(content_lines)
-    
-    # Determine border color based on activity and errors
-    error_downloads = [d for d, s in downloads if "❌" in d]
-    successful_downloads = [d for d, s in downloads if "✅" in d]
+    # Plain Text: the lines carry no markup, and log text such as "[Instagram]"
+    # must not be parsed as markup tags when the panel renders
+    content = Text("\n".join(content_lines))
     
-    if last_error or error_downloads:
+    # Determine border color based on activity and errors. Every ❌ entry is
+    # tagged "error" and every ✅ entry "completed", so test the tags directly
+    statuses = {status for download, status in downloads}
+    if last_error or "error" in statuses:
         border_color = "red"
-    elif successful_downloads:
+    elif "completed" in statuses:
         border_color = "green"  
     elif downloads:
         border_color = "yellow"  # Downloads in progress
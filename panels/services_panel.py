@@ -19,14 +19,15 @@ def create_services_panel(monitor) -> Panel:
     table.add_column("Memory", style="blue", width=8)
     
     docker_stats = monitor.get_docker_stats()
+    # All services are probed in parallel rather than one after another
+    health_results = monitor.check_all_services()
     
-    for service_name in monitor.services:
-        health = monitor.check_service_health(service_name)
+    for service_name, health in health_results.items():
         container_name = monitor.services[service_name]["container"]
         stats = docker_stats.get(container_name, {"cpu": "N/A", "memory": "N/A"})
         
         # Simple status display
-        status = health["status"]
+        status = health.status
         if "🟢" in status:
             status = "✅ OK"
         elif "🔴" in status:
@@ -35,14 +36,14 @@ def create_services_panel(monitor) -> Panel:
             status = "⚠️ Unknown"
         
         # Get details if available
-        details = health.get("details", "")
+        details = health.details
         if len(details) > 24:
             details = details[:21] + "..."
         
         table.add_row(
             service_name,
             status,
-            health["response_time"],
+            health.response_time,
             details,
             stats["cpu"],
             stats["memory"]
@@ -4,12 +4,15 @@ Unified Video Activity Panel
 Displays video transcoding activity from all services (Mac Mini, Raspberry Pi, Render)
 """
 
+from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from datetime import datetime
+from io import StringIO
 import asyncio
 from monitors.unified_video_monitor import get_unified_video_activity, get_cached_video_activity
+from utils.timestamps import parse_datetime
 
 
 def parse_device_display(platform, device_info):
@@ -70,6 +73,7 @@ def create_unified_video_activity_panel():
         
         logs = activity_data['logs']
         service_status = activity_data.get('service_status', {})
+        service_meta = activity_data.get('service_meta', {})
         summary = activity_data.get('summary', {})
         last_update = activity_data.get('last_update')
         
@@ -121,14 +125,15 @@ def create_unified_video_activity_panel():
         for log in logs[:8]:  # Show last 8 operations
             # Format timestamp
             try:
-                dt = datetime.fromisoformat(log['timestamp'].replace('Z', '+00:00'))
+                dt = parse_datetime(log['timestamp'])
                 time_str = dt.strftime('%H:%M:%S')
             except:
                 time_str = "Unknown"
             
             # Service info (increased width from 10 to 15)
-            service_icon = log.get('service_icon', '🔧')
-            service_name = log.get('service_name', 'Unknown')
+            meta = service_meta.get(log.get('service'), {})
+            service_icon = meta.get('icon', '🔧')
+            service_name = meta.get('name', 'Unknown')
             if len(service_name) > 12:
                 service_short = service_name[:12]
             else:
@@ -203,8 +208,6 @@ def create_unified_video_activity_panel():
         content = header + "\n" + str(table)
         
         # Render table properly using Rich console
-        from rich.console import Console
-        from io import StringIO
         temp_console = Console(file=StringIO(), width=140)  # Use wider width for full table
         temp_console.print(table)
         table_str = temp_console.file.getvalue()
@@ -4,11 +4,11 @@ Video Transcoder Panel
 Displays the latest transcoding operations from the video-worker service
 """
 
-import requests
+from io import StringIO
+from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
-from datetime import datetime
 import json
 import sys
 from pathlib import Path
@@ -16,6 +16,8 @@ from pathlib import Path
 # Import configuration
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import VIDEO_EXTERNAL_URL, VIDEO_LOCAL_URL
+from utils.http import session
+from utils.timestamps import parse_datetime
 
 
 def parse_device_display(platform, device_info):
@@ -76,11 +78,9 @@ def create_video_transcoder_panel(monitor, title: str = "📹 Video Transcoder")
     """Create video transcoder panel showing latest transcode operations"""
     
     try:
-        import requests
-        
         # Fetch logs from video-worker service via Tailscale Funnel
         video_url = VIDEO_EXTERNAL_URL if VIDEO_EXTERNAL_URL else VIDEO_LOCAL_URL
-        response = requests.get(f'{video_url}/logs?limit=10', timeout=10)
+        response = session.get(f'{video_url}/logs?limit=10', timeout=10)
         if response.status_code == 200:
             data = response.json()
             logs = data.get('logs', [])
@@ -117,7 +117,7 @@ def create_video_transcoder_panel(monitor, title: str = "📹 Video Transcoder")
                     time_str = ''
                     if timestamp:
                         try:
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                            dt = parse_datetime(timestamp)
                             time_str = dt.strftime('%H:%M:%S')
                         except:
                             time_str = timestamp[-8:] if len(timestamp) >= 8 else timestamp
@@ -168,28 +168,6 @@ def create_video_transcoder_panel(monitor, title: str = "📹 Video Transcoder")
                     user_display = f"{user}" if hp == 'N/A' else f"{user} ({hp} HP)"
                     line = f"{status_icon} [{status_color}]{time_str}[/{status_color}] {device_display} [bold]{user_display}[/bold] - {filename} [{status_color}]{duration_str}[/{status_color}]"
                     lines.append(line)
-                    if status == 'completed':
-                        duration = log.get('processingTime', 'unknown')
-                        output_size = log.get('outputSize', 'unknown')
-                        status_icon = "✅"
-                        details = f"({duration:.1f}s, {output_size})" if isinstance(duration, (int, float)) else ""
-                    elif status == 'error':
-                        error = log.get('error', 'Unknown error')
-                        status_icon = "❌"
-                        details = f"({error})"
-                    else:
-                        status_icon = "⏳"
-                        details = ""
-                    
-                    # Format HP indicator
-                    if hp != 'unknown' and isinstance(hp, (int, float)):
-                        hp_indicator = f"⚡{hp}"
-                    else:
-                        hp_indicator = ""
-                    
-                    # Build the line
-                    line = f"{status_icon} {user} {hp_indicator} {device_display} {time_str} {details}"
-                    lines.append(line)
                 
                 content = "\n".join(lines)
         else:
@@ -227,7 +205,7 @@ def create_transcoder_panel_with_data(logs, stats, title):
         for log in completed_logs[:5]:  # Show last 5 completed operations
             # Format timestamp
             try:
-                dt = datetime.fromisoformat(log['timestamp'].replace('Z', '+00:00'))
+                dt = parse_datetime(log['timestamp'])
                 time_str = dt.strftime('%H:%M:%S')
             except:
                 time_str = "Unknown"
@@ -293,9 +271,6 @@ def create_transcoder_panel_with_data(logs, stats, title):
     content_parts.append("Recent Operations:")
     
     # Convert table to string
-    from rich.console import Console
-    from io import StringIO
-    
     console = Console(file=StringIO(), width=60)
     console.print(table)
     table_str = console.file.getvalue()
@@ -6,7 +6,6 @@ size restrictions, and other browser-side issues.
 """
 
 import json
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from rich.panel import Panel
@@ -20,6 +19,8 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import TAILSCALE_HOSTNAME
+from utils.http import session
+from utils.timestamps import parse_datetime
 
 
 class WebappErrorTracker:
@@ -41,7 +42,7 @@ class WebappErrorTracker:
         """Get recent client errors from the webapp"""
         for base_url in self.base_urls:
             try:
-                response = requests.get(
+                response = session.get(
                     f"{base_url}/api/logs/client-errors?limit={limit}", 
                     timeout=5
                 )
@@ -86,7 +87,7 @@ class WebappErrorTracker:
             
             # Count recent errors (last hour)
             try:
-                error_time = datetime.fromisoformat(error.get('timestamp', '').replace('Z', '+00:00'))
+                error_time = parse_datetime(error.get('timestamp', ''))
                 if error_time.replace(tzinfo=None) >= one_hour_ago:
                     summary['recent_errors'] += 1
             except:
@@ -124,7 +125,7 @@ def create_webapp_logs_panel() -> Panel:
             timestamp = error.get('timestamp', '')
             try:
                 # Parse and format timestamp
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                dt = parse_datetime(timestamp)
                 time_str = dt.strftime('%H:%M:%S')
             except:
                 time_str = timestamp[:8] if timestamp else 'N/A'
@@ -156,7 +157,6 @@ def create_webapp_logs_panel() -> Panel:
             )
         
         # Create summary info
-        total_errors = summary['total']
         recent_errors = summary['recent_errors']
         upload_errors = summary['upload_errors']
         size_restrictions = summary['size_restrictions']
@@ -172,18 +172,6 @@ def create_webapp_logs_panel() -> Panel:
             
         title = " ".join(title_parts)
         
-        # Status line
-        status_text = Text()
-        status_text.append(f"Total: {total_errors} ", style="bold")
-        status_text.append(f"Recent (1h): {recent_errors} ", style="red" if recent_errors > 0 else "green")
-        status_text.append(f"Upload: {upload_errors} ", style="yellow" if upload_errors > 0 else "dim")
-        status_text.append(f"Size: {size_restrictions}", style="orange1" if size_restrictions > 0 else "dim")
-        
-        # Combine table with status
-        content = Text()
-        content.append(status_text)
-        content.append("\n\n")
-        
         # Return panel with table
         return Panel(
             table,
@@ -34,11 +34,11 @@ def main():
         
         print(f"\n{service_display.get(service_name, service_name)}")
         print(f"   Endpoint: {service_config['url']}")
-        print(f"   Status: {health['status']}")
-        print(f"   Response: {health['response_time']}")
-        print(f"   Details: {health.get('details', 'N/A')}")
+        print(f"   Status: {health.status}")
+        print(f"   Response: {health.response_time}")
+        print(f"   Details: {health.details or 'N/A'}")
         
-        if "🔴" in health['status']:
+        if "🔴" in health.status:
             all_healthy = False
     
     print("\n" + "=" * 70)
@@ -27,9 +27,9 @@ async def test_endpoints():
         
         health = monitor.check_service_health(service_name)
         
-        print(f"   Status: {health['status']}")
-        print(f"   Response Time: {health['response_time']}")
-        print(f"   Details: {health.get('details', 'N/A')}")
+        print(f"   Status: {health.status}")
+        print(f"   Response Time: {health.response_time}")
+        print(f"   Details: {health.details or 'N/A'}")
     
     print("\n" + "=" * 60)
     print("✅ Endpoint test complete!")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test Logs Panel Parsing
+Feed known worker log lines to the logs panel parsers and check the events they produce
+"""
+
+from collections import deque
+
+from panels.logs_panel import _parse_video_worker_line, _parse_ytipfs_line
+
+def test_ytipfs_no_video_line():
+    """yt-dlp's no-video failure is reported as such, not as a generic Instagram error"""
+    downloads = deque(maxlen=4)
+    line_error = _parse_ytipfs_line("ERROR: [Instagram] DAbc123: There is no video in this post", downloads)
+    
+    assert list(downloads) == [("❌ No video in IG post", "error")]
+    assert line_error == "Instagram post contains no video"
+
+def test_ytipfs_instagram_error_line():
+    """Other Instagram errors still name the post and the message"""
+    downloads = deque(maxlen=4)
+    line_error = _parse_ytipfs_line("ERROR: [Instagram] DAbc123: Login required", downloads)
+    
+    assert list(downloads) == [("❌ Failed: DAbc123", "error")]
+    assert line_error == "IG DAbc123: Login required"
+
+def test_video_worker_success_line():
+    """A TRANSCODE-SUCCESS line wins over the POST /transcode request it mentions"""
+    downloads = deque(maxlen=4)
+    line_error = _parse_video_worker_line("TRANSCODE-SUCCESS | ID: 1a2b3c4d | Duration: 5230ms | POST /transcode", downloads)
+    
+    assert list(downloads) == [("✅ Completed: 1a2b3c4d (5230ms)", "completed")]
+    assert line_error is None
+
+if __name__ == "__main__":
+    test_ytipfs_no_video_line()
+    test_ytipfs_instagram_error_line()
+    test_video_worker_success_line()
+    print("✅ Logs panel parsing tests passed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Cache Utilities
+Small time-based memoization for probes that the dashboard repeats every refresh
+"""
+
+import functools
+import threading
+import time
+from concurrent.futures import Future
+
+
+def ttl_cache(ttl: float, stale: float = 0.0, is_ok=None):
+    """Memoize a function per positional arguments for ttl seconds
+
+    Concurrent misses for the same arguments share one call: the first caller
+    runs it and the rest wait for its result. With is_ok and stale set, a failed
+    result (is_ok false) is replaced by the last good dict result if that is
+    younger than stale seconds, marked with 'stale' and 'stale_age' keys so
+    callers can flag it.
+    """
+    def decorator(func):
+        cache = {}
+        last_good = {}
+        in_flight = {}
+        lock = threading.Lock()
+
+        def compute(args):
+            now = time.monotonic()
+            value = func(*args)
+            if is_ok is None or is_ok(value):
+                last_good[args] = (now, value)
+            else:
+                good = last_good.get(args)
+                if good and now - good[0] < stale:
+                    value = dict(good[1], stale=True, stale_age=now - good[0])
+            cache[args] = (now + ttl, value)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            hit = cache.get(args)
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+
+            with lock:
+                # A call that just finished may have filled the cache
+                hit = cache.get(args)
+                if hit and hit[0] > time.monotonic():
+                    return hit[1]
+                future = in_flight.get(args)
+                leader = future is None
+                if leader:
+                    future = in_flight[args] = Future()
+
+            if not leader:
+                return future.result()
+
+            try:
+                value = compute(args)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(value)
+                return value
+            finally:
+                with lock:
+                    del in_flight[args]
+
+        def cache_clear():
+            cache.clear()
+            last_good.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+HTTP Utilities
+Shared keep-alive session for the panels and monitors that poll service endpoints
+"""
+
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# Accepts str or bytes; orjson when installed, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+# need to catch the stdlib exception.
+json_loads = orjson.loads if orjson else json.loads
+
+
+def create_session(pool_size: int = 32) -> requests.Session:
+    """Create a requests session that keeps connections alive between polls"""
+    http = requests.Session()
+    http.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    return http
+
+
+# Process-wide session; every dashboard refresh reuses its TCP/TLS connections
+session = create_session()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Skip requests to a host for a while after repeated failures
+
+    After `threshold` consecutive failures (exceptions or 5xx responses) to the
+    same host, requests to it fail fast with CircuitOpenError for `cooldown`
+    seconds instead of each waiting out its timeout. Any success resets the count.
+    """
+    
+    def __init__(self, threshold: int = 3, cooldown: float = 60.0, http: requests.Session = None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.http = http or session
+        # host -> (consecutive failures, time.monotonic() the circuit stays open until)
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _record(self, host: str, failed: bool):
+        """Count a failure for host, opening its circuit at the threshold, or reset it"""
+        with self._lock:
+            if not failed:
+                self._hosts.pop(host, None)
+                return
+            failures = self._hosts.get(host, (0, 0.0))[0] + 1
+            open_until = time.monotonic() + self.cooldown if failures >= self.threshold else 0.0
+            self._hosts[host] = (failures, open_until)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """session.get through the breaker for url's host"""
+        host = urlsplit(url).netloc
+        open_until = self._hosts.get(host, (0, 0.0))[1]
+        remaining = open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"{host} unreachable, retrying in {int(remaining) + 1}s")
+        
+        try:
+            response = self.http.get(url, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(host, failed=True)
+            raise
+        self._record(host, failed=response.status_code >= 500)
+        return response
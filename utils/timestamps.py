@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Timestamp Utilities
+Parse service log timestamps once into epoch seconds for cheap sorting and comparison
+"""
+
+import sys
+from datetime import datetime
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # ciso8601 is an optional speedup
+    if sys.version_info >= (3, 11):
+        # The C fromisoformat accepts a trailing 'Z' from 3.11 on
+        parse_datetime = datetime.fromisoformat
+    else:
+        def parse_datetime(value: str) -> datetime:
+            """Parse an ISO-8601 string, accepting a trailing 'Z' for UTC"""
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def parse_timestamp(value) -> float:
+    """Convert an ISO-8601 log timestamp to epoch seconds, or 0.0 when missing or malformed"""
+    try:
+        return parse_datetime(value).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def log_time_key(stamp: str) -> str:
+    """Sortable form of a `docker logs --timestamps` RFC3339Nano stamp (fraction padded to 9 digits)"""
+    head, _, frac = stamp.rstrip('Z').partition('.')
+    return f"{head}.{frac.ljust(9, '0')}"